@@ -0,0 +1,57 @@
+import tempfile
+try:
+    import xlsxwriter
+except ImportError:
+    xlsxwriter = None
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font
+
+# xlsxwriter only writes new workbooks, which is all we need, and is much faster than openpyxl
+EXCEL_ENGINE = 'xlsxwriter' if xlsxwriter is not None else 'openpyxl'
+
+def streaming_engine_kwargs():
+    """
+    ExcelWriter engine_kwargs that flush finished rows to disk instead of holding each sheet.
+    Only valid when every sheet is written with write_sheet
+    """
+    if EXCEL_ENGINE == 'xlsxwriter':
+        return {'options': {
+            'constant_memory': True,
+            'use_zip64': True,  # Allow parts larger than 4 GB for very large Fee Detail sheets
+            'tmpdir': tempfile.gettempdir(),
+        }}
+    return {'write_only': True}
+
+def write_sheet(writer, df, sheet_name, index=False):
+    """
+    Write a DataFrame to a new sheet strictly row by row, skipping the per-cell work of to_excel.
+    With index, the index is written as the first column, as to_excel does
+    """
+    header = list(df.columns)
+    if index:
+        # Like to_excel, write tuple labels (the pivots' year/month pairs) as their text
+        labels = [str(label) if isinstance(label, tuple) else label for label in df.index]
+        header.insert(0, df.index.name)
+        df = df.reset_index(drop=True)
+        df.insert(0, '__index__', labels)
+    # Excel has no NaN; blank cells are what to_excel writes for missing values
+    if df.isna().to_numpy().any():
+        df = df.astype(object).where(df.notna(), None)
+    rows = df.itertuples(index=False, name=None)
+
+    if EXCEL_ENGINE == 'xlsxwriter':
+        worksheet = writer.book.add_worksheet(sheet_name)
+        worksheet.write_row(0, 0, header, writer.book.add_format({'bold': True}))
+        for row_number, row in enumerate(rows, start=1):
+            worksheet.write_row(row_number, 0, row)
+    else:
+        worksheet = writer.book.create_sheet(sheet_name)
+        # Write-only sheets can't be edited after append, so style the header cells up front
+        header_cells = []
+        for column in header:
+            cell = WriteOnlyCell(worksheet, value=column)
+            cell.font = Font(bold=True)
+            header_cells.append(cell)
+        worksheet.append(header_cells)
+        for row in rows:
+            worksheet.append(row)
@@ -1,28 +1,224 @@
 import os
 import re
+import sys
+import argparse
+import functools
+import itertools
+import logging
+import numpy as np
 import pandas as pd
 import PyPDF2
-from pathlib import Path
-from nltk.stem import PorterStemmer
-import nltk
-from datetime import datetime
-
-# Download required NLTK data
 try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    print("Downloading NLTK punkt tokenizer...")
-    nltk.download('punkt')
-
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+try:
+    import pypdfium2 as pdfium
+except ImportError:
+    pdfium = None
+try:
+    import Stemmer
+except ImportError:
+    Stemmer = None
+try:
+    import numba
+except ImportError:
+    numba = None
 try:
-    nltk.data.find('tokenizers/punkt_tab')
-except LookupError:
-    print("Downloading NLTK punkt_tab tokenizer...")
-    nltk.download('punkt_tab')
+    import pyexcelerate
+except ImportError:
+    pyexcelerate = None
+from pdf_batch import iter_in_order, positive_int, find_pdf_files, cached_frames
+from excel_sheets import EXCEL_ENGINE, streaming_engine_kwargs, write_sheet
+
+logger = logging.getLogger(__name__)
 
 # Initialize stemmer
-stemmer = PorterStemmer()
+if Stemmer is not None:
+    # PyStemmer (C Snowball) stems the whole token list in one call and keeps its own cache
+    stemmer = Stemmer.Stemmer('porter', 50000)
+    _stem_words = stemmer.stemWords
+else:
+    # Fall back to NLTK's pure-Python stemmer, using the same original Porter rules;
+    # the same tokens recur across descriptions, so memoize stem()
+    from nltk.stem import PorterStemmer
+    stemmer = PorterStemmer(mode=PorterStemmer.ORIGINAL_ALGORITHM)
+    _stem = functools.lru_cache(maxsize=50000)(stemmer.stem)
+
+    def _stem_words(words):
+        return [_stem(word) for word in words]
+
+# Task categories with their keywords (stemmed and original)
+TASK_CATEGORIES = {
+    'motion to compel': [
+        'motion to compel', 'compel motion', 'compel', 'opposition to motion to compel'
+    ],
+    'subpoena': [
+        'subpoena', 'subpeona', 'subpoenas', 'subpeonas'
+    ],
+    'discovery': [
+        'discoveri', 'discover', 'product', 'interrogatori', 'product', 
+        'product', 'admiss', 'product', 'product', 'rfp', 'rogs', 'srogs',
+        'rfas', 'request for product', 'request for admiss', 'special interrogatori'
+    ],
+    'drafting motion': [
+        'draft motion', 'draft brief', 'prepar motion', 'motion draft',
+        'brief draft', 'motion prepar', 'draft oppos', 'oppos motion'
+    ],
+    'CMC statement': [
+        'cmc statement', 'case manag confer statement', 'status statement',
+        'joint status report', 'status confer statement', 'case manag conference'
+    ],
+    'CMC attendance': [
+        'attend cmc', 'cmc attend', 'case manag confer', 'status confer',
+        'particip cmc', 'appear cmc'
+    ],
+    'meet and confer': [
+        'meet confer', 'meet and confer', 'confer with', 'discuss with',
+        'meet with', 'M&C'
+    ],
+    'RFP': [
+        'rfp', 'request for product', 'product request', 'product respons'
+    ],
+    'ROG': [
+        'rog', 'interrogatori', 'special interrogatori', 'srog',
+        'respons to interrogatori', 'object to interrogatori'
+    ],
+    'interrogatories': [
+        'interrogatori', 'interrog', 'respons to interrogatori',
+        'object to interrogatori', 'special interrogatori'
+    ],
+    'court attendance': [
+        'court appear', 'attend hearing', 'attend confer', 'appear before',
+        'court hearing', 'status hearing', 'motion hearing'
+    ],
+    'settlement': [
+        'settlement', 'settle', 'settlement discuss', 'settlement confer',
+        'settlement propos', 'settlement negoti', 'settlement agreement'
+    ],
+    'client communication': [
+        'client', 'email client', 'call client', 'discuss with client',
+        'updat client', 'client updat', 'client meet'
+    ],
+    'legal research': [
+        'research', 'analysi', 'review law', 'legal research',
+        'case law', 'statutor', 'regulator', 'legal analysi'
+    ],
+    'document review': [
+        'review', 'draft review', 'document review', 'review document',
+        'review draft', 'revis', 'edit'
+    ]
+}
 
+def _keyword_categories(task_categories):
+    """
+    Map every keyword to the categories it belongs to
+    """
+    keyword_categories = {}
+    for category, keywords in task_categories.items():
+        for keyword in keywords:
+            categories = keyword_categories.setdefault(keyword, [])
+            if category not in categories:
+                categories.append(category)
+    return keyword_categories
+
+def _build_keyword_automaton(task_categories):
+    """
+    Build an Aho-Corasick automaton mapping every keyword to the categories it belongs to
+    """
+    automaton = ahocorasick.Automaton()
+    for keyword, categories in _keyword_categories(task_categories).items():
+        automaton.add_word(keyword, tuple(categories))
+    automaton.make_automaton()
+    return automaton
+
+def _build_keyword_regex(task_categories):
+    """
+    Build one alternation of all keywords, plus the categories found by each match
+    """
+    keyword_categories = _keyword_categories(task_categories)
+    # Longest keywords first, so each position reports the longest keyword starting there
+    keywords = sorted(keyword_categories, key=len, reverse=True)
+    # A zero-width lookahead tries every position, so overlapping keywords are all seen
+    pattern = re.compile('(?=(' + '|'.join(re.escape(k) for k in keywords) + '))')
+    
+    # Any shorter keyword that is a prefix of the match occurs at the same position
+    match_categories = {}
+    for keyword in keywords:
+        categories = []
+        for other in keywords:
+            if keyword.startswith(other):
+                categories.extend(c for c in keyword_categories[other] if c not in categories)
+        match_categories[keyword] = tuple(categories)
+    return pattern, match_categories
+
+# Built once at import so categorize_task does a single pass per text
+if ahocorasick is not None:
+    _KW_AUTOMATON = _build_keyword_automaton(TASK_CATEGORIES)
+
+    def _add_keyword_categories(text, matched):
+        for _, categories in _KW_AUTOMATON.iter(text):
+            matched.update(categories)
+else:
+    # Without pyahocorasick, fall back to a single regex alternation
+    _KW_RE, _KW_MATCH_CATEGORIES = _build_keyword_regex(TASK_CATEGORIES)
+
+    def _add_keyword_categories(text, matched):
+        for match in _KW_RE.finditer(text):
+            matched.update(_KW_MATCH_CATEGORIES[match.group(1)])
+
+# Priority for more specific legal tasks
+PRIORITY_CATEGORIES = ['drafting motion', 'court attendance', 'CMC attendance', 
+                       'settlement', 'discovery', 'RFP', 'ROG', 'interrogatories']
+
+# Rank of every category: priority categories first, then the rest in definition order
+_CATEGORY_RANK = {category: rank for rank, category in enumerate(
+    PRIORITY_CATEGORIES + [category for category in TASK_CATEGORIES if category not in PRIORITY_CATEGORIES]
+)}
+
+# Word splitting for keyword matching only; no sentence tokenizer needed
+_TOKEN_RE = re.compile(r"[A-Za-z&]+")
+
+# Patterns used by the extract_* helpers, compiled once at import
+_INVOICE_DATE_PATTERNS = [re.compile(p) for p in (
+    r'Invoice Date\s+(\d{1,2}-[A-Za-z]{3}-\d{4})',
+    r'Invoice Date\s+([A-Za-z]+\s+\d{1,2},\s+\d{4})',
+    r'(\d{1,2}-[A-Za-z]{3}-\d{4})\s*Invoice Date',
+)]
+_INVOICE_NO_PATTERNS = [re.compile(p) for p in (
+    r'Invoice No\.\s*([A-Za-z0-9-]+)',
+    r'Invoice No\s+([A-Za-z0-9-]+)',
+    r'Invoice Number\s+([A-Za-z0-9-]+)',
+)]
+_MATTER_NO_PATTERNS = [re.compile(p) for p in (
+    r'Our Matter No\.\s*([A-Za-z0-9.-]+)',
+    r'Matter No\.\s*([A-Za-z0-9.-]+)',
+    r'Our Matter Number\s+([A-Za-z0-9.-]+)',
+)]
+# Look for patterns like "REPRESENT TCL AGAINST CADENCE DESIGN SYSTEM, INC. 23-00339"
+# This typically appears after the matter number and invoice number
+_MATTER_DESC_PATTERNS = [re.compile(p, re.IGNORECASE | re.MULTILINE) for p in (
+    r'Our Matter No\.\s*[A-Za-z0-9.-]+\s*Invoice No\.\s*[A-Za-z0-9-]+\s*(REPRESENT[^\n]+)',
+    r'Matter No\.\s*[A-Za-z0-9.-]+\s*Invoice No\.\s*[A-Za-z0-9-]+\s*(REPRESENT[^\n]+)',
+    r'REPRESENT[^\n]+(?:\n[^\n]+)*',  # Look for any line starting with REPRESENT
+    r'For professional services in connection with[^\n]+',  # Alternative pattern
+)]
+_MATTER_DESC_GENERAL = re.compile(r'Our Matter No\.\s*[A-Za-z0-9.-]+\s*Invoice No\.\s*[A-Za-z0-9-]+\s*(.*?)(?=FEE SUMMARY|$)', re.IGNORECASE | re.DOTALL)
+_WHITESPACE_RE = re.compile(r'\s+')
+# Section markers are literal; the section itself is sliced out between them
+_FEE_SUMMARY_START = re.compile('FEE SUMMARY', re.IGNORECASE)
+_FEE_SUMMARY_END = re.compile('FEE DETAIL|Total Hours|\n\n', re.IGNORECASE)
+# Example: "Cloern, B. 10.30 1,150.00"
+_FEE_SUMMARY_LINE = re.compile(r'^([A-Za-z]+(?:[-\' ][A-Za-z]+)*(?:,\s*[A-Za-z.]+)+)\s+(\d+\.\d+)\s+([0-9,]+\.\d{2})')
+_FEE_DETAIL_START = re.compile('FEE DETAIL', re.IGNORECASE)
+_FEE_DETAIL_TOTAL = re.compile(r'Total\s+\d+\.\d{2}')
+# Example: "11-Jul-24 Rorwin, J.K. 0.50 Review draft email..." (hyphenated names allowed)
+# Scanned over the whole text, so whitespace is [^\S\n] to keep every match on one line
+_FEE_DETAIL_LINE = re.compile(r'^[^\S\n]*(\d{1,2}-[A-Za-z]{3}-\d{2,4})[^\S\n]+([A-Za-z]+(?:(?:[^\S\n]|-)*[A-Za-z]*(?:,[^\S\n]*[A-Za-z.]+)*))[^\S\n]+(\d+\.\d+)[^\S\n]+(\S.*)', re.MULTILINE)
+_HYPHEN_SPACING_RE = re.compile(r'\s*-\s*')
+
+# Invoices repeat the same phrasings, and the result depends only on the description
+@functools.lru_cache(maxsize=10000)
 def categorize_task(description):
     """
     Categorize task based on description using stemming and keyword matching
@@ -31,118 +227,95 @@ def categorize_task(description):
         return "Other"
     
     try:
-        # Convert to lowercase and tokenize
+        # Check the original text first; it needs no tokenizing or stemming
         description_lower = description.lower()
-        words = nltk.word_tokenize(description_lower)
-        stemmed_words = [stemmer.stem(word) for word in words]
-        stemmed_text = ' '.join(stemmed_words)
+        matched = set()
+        _add_keyword_categories(description_lower, matched)
         
-        # Task categories with their keywords (stemmed and original)
-        task_categories = {
-            'motion to compel': [
-                'motion to compel', 'compel motion', 'compel', 'opposition to motion to compel'
-            ],
-            'subpoena': [
-                'subpoena', 'subpeona', 'subpoenas', 'subpeonas'
-            ],
-            'discovery': [
-                'discoveri', 'discover', 'product', 'interrogatori', 'product', 
-                'product', 'admiss', 'product', 'product', 'rfp', 'rogs', 'srogs',
-                'rfas', 'request for product', 'request for admiss', 'special interrogatori'
-            ],
-            'drafting motion': [
-                'draft motion', 'draft brief', 'prepar motion', 'motion draft',
-                'brief draft', 'motion prepar', 'draft oppos', 'oppos motion'
-            ],
-            'CMC statement': [
-                'cmc statement', 'case manag confer statement', 'status statement',
-                'joint status report', 'status confer statement', 'case manag conference'
-            ],
-            'CMC attendance': [
-                'attend cmc', 'cmc attend', 'case manag confer', 'status confer',
-                'particip cmc', 'appear cmc'
-            ],
-            'meet and confer': [
-                'meet confer', 'meet and confer', 'confer with', 'discuss with',
-                'meet with', 'M&C'
-            ],
-            'RFP': [
-                'rfp', 'request for product', 'product request', 'product respons'
-            ],
-            'ROG': [
-                'rog', 'interrogatori', 'special interrogatori', 'srog',
-                'respons to interrogatori', 'object to interrogatori'
-            ],
-            'interrogatories': [
-                'interrogatori', 'interrog', 'respons to interrogatori',
-                'object to interrogatori', 'special interrogatori'
-            ],
-            'court attendance': [
-                'court appear', 'attend hearing', 'attend confer', 'appear before',
-                'court hearing', 'status hearing', 'motion hearing'
-            ],
-            'settlement': [
-                'settlement', 'settle', 'settlement discuss', 'settlement confer',
-                'settlement propos', 'settlement negoti', 'settlement agreement'
-            ],
-            'client communication': [
-                'client', 'email client', 'call client', 'discuss with client',
-                'updat client', 'client updat', 'client meet'
-            ],
-            'legal research': [
-                'research', 'analysi', 'review law', 'legal research',
-                'case law', 'statutor', 'regulator', 'legal analysi'
-            ],
-            'document review': [
-                'review', 'draft review', 'document review', 'review document',
-                'review draft', 'revis', 'edit'
-            ]
-        }
-        
-        # Check each category
-        matched_categories = []
+        # Nothing the stemmed text adds can outrank the top priority category
+        if PRIORITY_CATEGORIES[0] in matched:
+            return PRIORITY_CATEGORIES[0]
         
-        for category, keywords in task_categories.items():
-            for keyword in keywords:
-                # Check both stemmed and original text
-                if (keyword in stemmed_text or 
-                    keyword in description_lower or
-                    any(keyword in stemmed_word for stemmed_word in stemmed_words)):
-                    matched_categories.append(category)
-                    break  # Only need one match per category
+        # Tokenize and stem, then check the stemmed text as well
+        words = _TOKEN_RE.findall(description_lower)
+        stemmed_text = ' '.join(_stem_words(words))
+        _add_keyword_categories(stemmed_text, matched)
         
         # Return the most specific category, or "Other" if no match
-        if matched_categories:
-            # Priority for more specific legal tasks
-            priority_categories = ['drafting motion', 'court attendance', 'CMC attendance', 
-                                  'settlement', 'discovery', 'RFP', 'ROG', 'interrogatories']
-            
-            for priority_cat in priority_categories:
-                if priority_cat in matched_categories:
-                    return priority_cat
-            
-            return matched_categories[0]  # Return first match if no priority category found
+        if matched:
+            return min(matched, key=_CATEGORY_RANK.__getitem__)
         
         return "Other"
     except Exception as e:
-        print(f"Error in task categorization: {e}")
+        logger.error("Error in task categorization: %s", e)
         return "Other"
 
+# PyPDF2 seeks and reads the file in small pieces; a 256 KiB buffer saves read() calls
+_PDF_READ_BUFFER = 1 << 18
+
+def _iter_page_text(pdf_path):
+    """
+    Yield the text of each page, using pdfium when available and PyPDF2 otherwise
+    """
+    if pdfium is not None:
+        pdf = pdfium.PdfDocument(pdf_path)
+        try:
+            for page in pdf:
+                textpage = page.get_textpage()
+                # pdfium ends lines with CRLF; the extract_* patterns expect plain newlines
+                text = textpage.get_text_range().replace('\r\n', '\n')
+                # Release each page as soon as its text is out
+                textpage.close()
+                page.close()
+                yield text
+        finally:
+            pdf.close()
+        return
+    
+    with open(pdf_path, 'rb', buffering=_PDF_READ_BUFFER) as file:
+        pdf_reader = PyPDF2.PdfReader(file, strict=False)
+        for page in pdf_reader.pages:
+            yield page.extract_text()
+
+def read_pdf_text(pdf_path):
+    """
+    Read page text up to the end of the FEE DETAIL section
+    """
+    # PyPDF2 page text has always been concatenated as is; pdfium pages are joined by lines
+    separator = '\n' if pdfium is not None else ''
+    pages_text = []
+    fee_detail_seen = False
+    
+    pages = _iter_page_text(pdf_path)
+    try:
+        for page_text in pages:
+            pages_text.append(page_text)
+            
+            # Pages after the fee detail Total line (appendices) are never needed
+            start = 0
+            if not fee_detail_seen:
+                fee_detail_match = _FEE_DETAIL_START.search(page_text)
+                if fee_detail_match:
+                    fee_detail_seen = True
+                    start = fee_detail_match.end()
+            if fee_detail_seen and _FEE_DETAIL_TOTAL.search(page_text, start):
+                break
+    finally:
+        # Close the document now rather than when the generator is collected
+        pages.close()
+    
+    return separator.join(pages_text)
+
 def extract_invoice_data(pdf_path):
     """
     Extract invoice data from PDF file
     """
     try:
-        with open(pdf_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            text = ""
-            for page in pdf_reader.pages:
-                text += page.extract_text()
-            print(f"Reading {pdf_path}")
-            print(text)
+        text = read_pdf_text(pdf_path)
+        logger.info("Reading %s", pdf_path)
         return extract_data_from_text(text, pdf_path.name)
     except Exception as e:
-        print(f"Error reading PDF {pdf_path}: {e}")
+        logger.error("Error reading PDF %s: %s", pdf_path, e)
         return None, None
 
 def extract_data_from_text(text, filename):
@@ -165,42 +338,24 @@ def extract_data_from_text(text, filename):
 
 def extract_invoice_date(text):
     """Extract invoice date from text"""
-    date_patterns = [
-        r'Invoice Date\s+(\d{1,2}-[A-Za-z]{3}-\d{4})',
-        r'Invoice Date\s+([A-Za-z]+\s+\d{1,2},\s+\d{4})',
-        r'(\d{1,2}-[A-Za-z]{3}-\d{4})\s*Invoice Date',
-    ]
-    
-    for pattern in date_patterns:
-        match = re.search(pattern, text)
+    for pattern in _INVOICE_DATE_PATTERNS:
+        match = pattern.search(text)
         if match:
             return match.group(1)
     return "Not Found"
 
 def extract_invoice_no(text):
     """Extract invoice number from text"""
-    patterns = [
-        r'Invoice No\.\s*([A-Za-z0-9-]+)',
-        r'Invoice No\s+([A-Za-z0-9-]+)',
-        r'Invoice Number\s+([A-Za-z0-9-]+)',
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, text)
+    for pattern in _INVOICE_NO_PATTERNS:
+        match = pattern.search(text)
         if match:
             return match.group(1)
     return "Not Found"
 
 def extract_matter_no(text):
     """Extract matter number from text"""
-    patterns = [
-        r'Our Matter No\.\s*([A-Za-z0-9.-]+)',
-        r'Matter No\.\s*([A-Za-z0-9.-]+)',
-        r'Our Matter Number\s+([A-Za-z0-9.-]+)',
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, text)
+    for pattern in _MATTER_NO_PATTERNS:
+        match = pattern.search(text)
         if match:
             return match.group(1)
     return "Not Found"
@@ -208,39 +363,33 @@ def extract_matter_no(text):
 def extract_matter_description(text):
     """Extract matter description from text"""
     try:
-        # Look for patterns like "REPRESENT TCL AGAINST CADENCE DESIGN SYSTEM, INC. 23-00339"
-        # This typically appears after the matter number and invoice number
-        patterns = [
-            r'Our Matter No\.\s*[A-Za-z0-9.-]+\s*Invoice No\.\s*[A-Za-z0-9-]+\s*(REPRESENT[^\n]+)',
-            r'Matter No\.\s*[A-Za-z0-9.-]+\s*Invoice No\.\s*[A-Za-z0-9-]+\s*(REPRESENT[^\n]+)',
-            r'REPRESENT[^\n]+(?:\n[^\n]+)*',  # Look for any line starting with REPRESENT
-            r'For professional services in connection with[^\n]+',  # Alternative pattern
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE | re.MULTILINE)
+        for pattern in _MATTER_DESC_PATTERNS:
+            match = pattern.search(text)
             if match:
                 description = match.group(0).strip()
                 # Clean up the description - remove extra whitespace
-                description = re.sub(r'\s+', ' ', description)
+                description = _WHITESPACE_RE.sub(' ', description)
                 return description
         
         # If not found with specific patterns, try to find any text between matter/invoice info and FEE SUMMARY
-        general_pattern = r'Our Matter No\.\s*[A-Za-z0-9.-]+\s*Invoice No\.\s*[A-Za-z0-9-]+\s*(.*?)(?=FEE SUMMARY|$)'
-        match = re.search(general_pattern, text, re.IGNORECASE | re.DOTALL)
+        match = _MATTER_DESC_GENERAL.search(text)
         if match:
             description = match.group(1).strip()
             # Remove any extra whitespace and limit length
-            description = re.sub(r'\s+', ' ', description)
+            description = _WHITESPACE_RE.sub(' ', description)
             if len(description) > 200:  # If too long, take first part
                 description = description[:200] + "..."
             return description
         
         return "Not Found"
     except Exception as e:
-        print(f"Error extracting matter description: {e}")
+        logger.error("Error extracting matter description: %s", e)
         return "Not Found"
 
+# Keys of the rows returned by extract_fee_summary
+FEE_SUMMARY_COLUMNS = ['pdf_filename', 'date_of_invoice', 'invoice_no', 'matter_no', 'matter_description',
+                       'lawyer_name', 'hours', 'rate', 'total']
+
 def extract_fee_summary(text, filename, invoice_date, invoice_no, matter_no, matter_description):
     """
     Extract fee summary data from text
@@ -248,20 +397,18 @@ def extract_fee_summary(text, filename, invoice_date, invoice_no, matter_no, mat
     fee_summary_data = []
     
     # Find FEE SUMMARY section
-    fee_summary_match = re.search(r'FEE SUMMARY(.*?)(?=FEE DETAIL|Total Hours|\n\n|\Z)', text, re.IGNORECASE | re.DOTALL)
+    fee_summary_match = _FEE_SUMMARY_START.search(text)
     
     if fee_summary_match:
-        fee_summary_text = fee_summary_match.group(1)
-        
-        # Pattern to match timekeeper lines: Name, Hours, Rate
-        # Example: "Cloern, B. 10.30 1,150.00"
-        #pattern = r'^([A-Za-z]+(?:,\s*[A-Za-z.]+)+)\s+(\d+\.\d+)\s+([0-9,]+\.\d{2})'
-        pattern = r'^([A-Za-z]+(?:[-\' ][A-Za-z]+)*(?:,\s*[A-Za-z.]+)+)\s+(\d+\.\d+)\s+([0-9,]+\.\d{2})'
+        start = fee_summary_match.end()
+        end_match = _FEE_SUMMARY_END.search(text, start)
+        fee_summary_text = text[start:end_match.start() if end_match else None]
         
+        # Match timekeeper lines: Name, Hours, Rate
         lines = fee_summary_text.split('\n')
         for line in lines:
             line = line.strip()
-            match = re.match(pattern, line)
+            match = _FEE_SUMMARY_LINE.match(line)
             if match:
                 lawyer_name = match.group(1).strip()
                 hours = match.group(2)
@@ -282,6 +429,20 @@ def extract_fee_summary(text, filename, invoice_date, invoice_no, matter_no, mat
     
     return fee_summary_data
 
+# Columns of the rows returned by extract_fee_detail
+FEE_DETAIL_COLUMNS = ['pdf_filename', 'date', 'timekeeper', 'hours', 'description', 'task_category']
+# task_category has a handful of distinct values, so store it as a category. Text columns
+# use pandas' 'str' dtype, which is Arrow-backed (hashed and grouped in Arrow's C++ kernels)
+# whenever pyarrow is installed on pandas 3+, and plain object columns on older pandas
+FEE_DETAIL_DTYPES = {
+    'pdf_filename': 'str',
+    'date': 'str',
+    'timekeeper': 'str',
+    'hours': 'float64',
+    'description': 'str',
+    'task_category': 'category',
+}
+
 def extract_fee_detail(text, filename, matter_no=0):
     """
     Extract fee detail data from text
@@ -289,78 +450,39 @@ def extract_fee_detail(text, filename, matter_no=0):
     fee_detail_data = []
     
     # Find FEE DETAIL section
-    fee_detail_match = re.search(r'FEE DETAIL(.*?)(?=Total\s+\d+\.\d{2}|REPRESENT|\n\n|\Z)', text, re.IGNORECASE | re.DOTALL)
+    fee_detail_match = _FEE_DETAIL_START.search(text)
     
     if fee_detail_match:
-        fee_detail_text = fee_detail_match.group(1)
-        
-        # Pattern to match fee detail lines: Date, Timekeeper, Hours, Description
-        # Example: "11-Jul-24 Rorwin, J.K. 0.50 Review draft email..."
-        #pattern = r'^(\d{1,2}-[A-Za-z]{3}-\d{2,4})\s+([A-Za-z]+(?:,\s*[A-Za-z.]+)+)\s+(\d+\.\d+)\s+(.*)'
-        # fix hyphenated name
-        pattern = r'^(\d{1,2}-[A-Za-z]{3}-\d{2,4})\s+([A-Za-z]+(?:[\s-]*[A-Za-z]*(?:,\s*[A-Za-z.]+)*))\s+(\d+\.\d+)\s+(.*)'
-        
-        lines = text.split('\n')
-        current_entry = None
+        # Match fee detail lines: Date, Timekeeper, Hours, Description
+        matches = list(_FEE_DETAIL_LINE.finditer(text, fee_detail_match.start()))
         
-        for line in lines:
-            line = line.strip()
-            print(f"   {line}")
-            
-            # Check if this is a new entry
-            match = re.match(pattern, line)
-            if match:
-                # Save previous entry if exists
-                if current_entry:
-                    # Categorize task before saving
-                    current_entry['task_category'] = categorize_task(current_entry['description'])
-                    fee_detail_data.append(current_entry)
-                
-                # Start new entry
-                #matter_str = matter_no
-                date_str = match.group(1)
-                timekeeper = match.group(2).strip()
-                hours = match.group(3)
-                description = match.group(4).strip()
+        for i, match in enumerate(matches):
+            date_str = match.group(1)
+            timekeeper = match.group(2).strip()
+            hours = match.group(3)
+            description = match.group(4).strip()
 
-                # Clean up timekeeper name - remove extra spaces around hyphens
-                timekeeper = re.sub(r'\s*-\s*', '-', timekeeper)
-                
-                # Convert date format from "dd-mmm-yy" to "dd-mm-yyyy"
-                try:
-                    # Parse the original date
-                    date_obj = datetime.strptime(date_str, '%d-%b-%y')
-                    # Format to dd-mm-yyyy
-                    formatted_date = date_obj.strftime('%d-%m-%Y')
-                except ValueError:
-                    # If parsing fails, try with 4-digit year
-                    try:
-                        date_obj = datetime.strptime(date_str, '%d-%b-%Y')
-                        formatted_date = date_obj.strftime('%d-%m-%Y')
-                    except ValueError:
-                        # If both fail, keep original date
-                        formatted_date = date_str
-                        print(f"Warning: Could not parse date: {date_str}")
-                
-                current_entry = {
-                    'pdf_filename': filename,
-                    #'matter_no': matter_no,
-                    'date': date_str,
-                    'date_': formatted_date,  # Use the converted date
-                    'timekeeper': timekeeper,
-                    'hours': float(hours),
-                    'description': description
-                }
-            else:
-                # This is a continuation line, append to current description
-                if current_entry and line:
-                    current_entry['description'] += ' ' + line.strip()
-        
-        # Don't forget the last entry
-        if current_entry:
-            # Categorize task before saving
-            current_entry['task_category'] = categorize_task(current_entry['description'])
-            fee_detail_data.append(current_entry)
+            # Clean up timekeeper name - remove extra spaces around hyphens
+            timekeeper = _HYPHEN_SPACING_RE.sub('-', timekeeper)
+            
+            # Lines up to the next entry are continuation lines of this description
+            next_start = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+            for line in text[match.end():next_start].split('\n'):
+                line = line.strip()
+                if line:
+                    description += ' ' + line
+            
+            # Plain tuples in FEE_DETAIL_COLUMNS order; date is converted to date_
+            # once the DataFrame is built
+            fee_detail_data.append((
+                filename,
+                date_str,
+                timekeeper,
+                float(hours),
+                description,
+                # Categorize task before saving
+                categorize_task(description)
+            ))
     
     return fee_detail_data
 '''
@@ -421,6 +543,43 @@ def extract_fee_detail(text, filename):
     
     return fee_detail_data
 '''
+# Numeric kernels over float64 arrays; compiled with Numba when it is installed
+if numba is not None:
+    @numba.njit(cache=True)
+    def compute_amount(rates, hours):
+        out = np.empty_like(rates)
+        for i in range(rates.size):
+            out[i] = rates[i] * hours[i]
+        return out
+
+    @numba.njit(cache=True)
+    def _group_sum(codes, values, n_groups):
+        # Sequential scatter-add; a prange loop would race on shared groups
+        out = np.zeros(n_groups)
+        for i in range(codes.size):
+            if codes[i] >= 0 and not np.isnan(values[i]):
+                out[codes[i]] += values[i]
+        return out
+else:
+    def compute_amount(rates, hours):
+        return rates * hours
+
+    def _group_sum(codes, values, n_groups):
+        # Skip unmatched keys (-1) and NaN values, like groupby().sum()
+        mask = (codes >= 0) & ~np.isnan(values)
+        return np.bincount(codes[mask], weights=values[mask], minlength=n_groups)
+
+def group_sum(codes, values, n_groups):
+    """
+    Sum values per group code; code -1 marks rows that belong to no group
+    """
+    codes = np.asarray(codes)
+    # Float codes (e.g. ngroup() with NaN keys) can't index groups; say so instead of
+    # letting the kernel fail deep inside numba or bincount
+    if not np.issubdtype(codes.dtype, np.integer):
+        raise TypeError(f"group_sum needs integer group codes, got {codes.dtype}")
+    return _group_sum(codes.astype(np.intp, copy=False), values, n_groups)
+
 def add_rate_to_fee_detail(fee_detail_df, fee_summary_df):
     """
     Add rate to Fee Detail by matching with Fee Summary data
@@ -428,23 +587,48 @@ def add_rate_to_fee_detail(fee_detail_df, fee_summary_df):
     if fee_detail_df.empty or fee_summary_df.empty:
         return fee_detail_df
     
-    # Create a mapping from (pdf_filename, lawyer_name) to rate
-    rate_mapping = {}
-    for _, row in fee_summary_df.iterrows():
-        key = (row['pdf_filename'], row['lawyer_name'])
-        rate_mapping[key] = row['rate']
-    
-    # Add rate column to fee_detail_df
-    fee_detail_df['rate'] = fee_detail_df.apply(
-        lambda row: rate_mapping.get((row['pdf_filename'], row['timekeeper']), 0), 
-        axis=1
+    # Map (pdf_filename, lawyer_name) to rate; the last summary line wins for duplicates
+    rate_mapping = (
+        fee_summary_df[['pdf_filename', 'lawyer_name', 'rate']]
+        .rename(columns={'lawyer_name': 'timekeeper'})
+        .drop_duplicates(['pdf_filename', 'timekeeper'], keep='last')
     )
     
+    # Look up each detail row's (pdf_filename, timekeeper) in one hash probe; unmatched rows get 0
+    rate_keys = pd.MultiIndex.from_frame(rate_mapping[['pdf_filename', 'timekeeper']])
+    positions = rate_keys.get_indexer(pd.MultiIndex.from_frame(fee_detail_df[['pdf_filename', 'timekeeper']]))
+    rates = rate_mapping['rate'].to_numpy(dtype=np.float64)
+    rate = np.where(positions >= 0, rates[positions], 0.0)
+    
     # Calculate amount (rate × hours)
-    fee_detail_df['amount'] = fee_detail_df['rate'] * fee_detail_df['hours']
+    fee_detail_df = fee_detail_df.assign(
+        rate=rate,
+        amount=compute_amount(rate, fee_detail_df['hours'].to_numpy(dtype=np.float64)),
+    )
     
     return fee_detail_df
 
+def parse_fee_detail_dates(dates):
+    """
+    Parse fee detail dates, handling different formats (e.g., "11-Jul-24", "11-Jul-2024")
+    """
+    date_dt = pd.to_datetime(dates, format='%d-%b-%y', errors='coerce')
+    # Only rows that did not parse with a 2-digit year are retried with a 4-digit year
+    return date_dt.fillna(pd.to_datetime(dates, format='%d-%b-%Y', errors='coerce'))
+
+def enrich_fee_detail(fee_detail_df):
+    """
+    Parse fee detail dates once and add the month columns shared by the monthly sheets
+    """
+    date_dt = parse_fee_detail_dates(fee_detail_df['date'])
+    
+    # Extract year and month for grouping; a period[M] column groups on int64 ordinals,
+    # so month labels are only formatted once per group, after aggregating
+    return fee_detail_df.assign(
+        date_dt=date_dt,
+        year_month=date_dt.dt.to_period('M'),
+    )
+
 def create_monthly_task_pivot(fee_detail_df):
     """
     Create a pivot table showing sum of hours by task category and month,
@@ -453,55 +637,45 @@ def create_monthly_task_pivot(fee_detail_df):
     if fee_detail_df.empty or 'task_category' not in fee_detail_df.columns:
         return pd.DataFrame()
     
-    # Create a copy to avoid modifying the original
-    df = fee_detail_df.copy()
+    # Month columns normally come precomputed from enrich_fee_detail
+    if 'year_month' not in fee_detail_df.columns:
+        fee_detail_df = enrich_fee_detail(fee_detail_df)
     
-    # Convert date to datetime and extract year-month
-    try:
-        # Handle different date formats (e.g., "11-Jul-24", "11-Jul-2024")
-        df['date_dt'] = pd.to_datetime(df['date'], format='%d-%b-%y', errors='coerce')
-        # If the above fails, try with 4-digit year
-        if df['date_dt'].isna().any():
-            df['date_dt'] = pd.to_datetime(df['date'], format='%d-%b-%Y', errors='coerce')
-        
-        # Extract year and month for grouping
-        df['year_month'] = df['date_dt'].dt.to_period('M')
-        df['month_name'] = df['date_dt'].dt.strftime('%Y-%m')
-    except Exception as e:
-        print(f"Error processing dates: {e}")
-        return pd.DataFrame()
+    # Only read from here on, so no copy is needed
+    df = fee_detail_df
     
-    # Group by task category and month, then aggregate
-    pivot_data = []
+    # Aggregate each timekeeper within a task category and month in one pass
+    tk_agg = df.groupby(['task_category', 'year_month', 'timekeeper'], observed=True).agg(
+        tk_hours=('hours', 'sum'),
+        tk_amount=('amount', 'sum'),
+        # Get the rate (should be consistent for same timekeeper in same period)
+        tk_rate=('rate', 'first')
+    ).reset_index()
     
-    for (task_category, month), group in df.groupby(['task_category', 'year_month']):
-        total_hours = group['hours'].sum()
-        total_amount = group['amount'].sum()
-        timekeepers = ', '.join(sorted(group['timekeeper'].unique()))
-        month_str = str(month)
-        
-        # Create timekeeper breakdown with rate×hours
-        timekeeper_breakdown = []
-        for timekeeper in sorted(group['timekeeper'].unique()):
-            tk_data = group[group['timekeeper'] == timekeeper]
-            tk_hours = tk_data['hours'].sum()
-            tk_amount = tk_data['amount'].sum()
-            # Get the rate (should be consistent for same timekeeper in same period)
-            tk_rate = tk_data['rate'].iloc[0] if not tk_data.empty else 0
-            timekeeper_breakdown.append(f"{timekeeper}: {tk_hours:.2f}h × ${tk_rate:.2f} = ${tk_amount:.2f}")
-        
-        timekeeper_details = '; '.join(timekeeper_breakdown)
-        
-        pivot_data.append({
-            'Task Category': task_category,
-            'Month': month_str,
-            'Total Hours': total_hours,
-            'Total Amount': total_amount,
-            'Timekeepers': timekeepers,
-            'Timekeeper Breakdown': timekeeper_details
-        })
+    if tk_agg.empty:
+        return pd.DataFrame()
     
-    pivot_df = pd.DataFrame(pivot_data)
+    # Create timekeeper breakdown with rate×hours
+    tk_agg['line'] = (tk_agg['timekeeper'] + ': ' + tk_agg['tk_hours'].map('{:.2f}h'.format)
+                      + ' × $' + tk_agg['tk_rate'].map('{:.2f}'.format)
+                      + ' = $' + tk_agg['tk_amount'].map('{:.2f}'.format))
+    
+    # Roll the timekeeper rows up to task category and month
+    pivot_df = tk_agg.groupby(['task_category', 'year_month'], observed=True).agg(
+        total_hours=('tk_hours', 'sum'),
+        total_amount=('tk_amount', 'sum'),
+        timekeepers=('timekeeper', ', '.join),
+        timekeeper_details=('line', '; '.join)
+    ).reset_index()
+    
+    pivot_df = pd.DataFrame({
+        'Task Category': pivot_df['task_category'],
+        'Month': pivot_df['year_month'].astype(str),
+        'Total Hours': pivot_df['total_hours'],
+        'Total Amount': pivot_df['total_amount'],
+        'Timekeepers': pivot_df['timekeepers'],
+        'Timekeeper Breakdown': pivot_df['timekeeper_details']
+    })
     
     # Sort by month and task category
     if not pivot_df.empty:
@@ -519,103 +693,48 @@ def create_monthly_timekeeper_pivot(fee_detail_df, fee_summary_df):
     if fee_detail_df.empty or fee_summary_df.empty:
         return pd.DataFrame()
     
-    # Create a copy to avoid modifying the original
-    df = fee_detail_df.copy()
+    # Month columns normally come precomputed from enrich_fee_detail
+    if 'year_month' not in fee_detail_df.columns:
+        fee_detail_df = enrich_fee_detail(fee_detail_df)
+    
+    # The merge below builds a new frame, so the caller's frame is never modified
+    df = fee_detail_df
     
     # Add matter_no and matter_description to fee_detail_df by merging with fee_summary_df
     matter_mapping = fee_summary_df[['pdf_filename', 'matter_no', 'matter_description']].drop_duplicates()
     df = df.merge(matter_mapping, on='pdf_filename', how='left')
     
-    # Convert date to datetime and extract year-month
-    try:
-        # Handle different date formats
-        df['date_dt'] = pd.to_datetime(df['date'], format='%d-%b-%y', errors='coerce')
-        if df['date_dt'].isna().any():
-            df['date_dt'] = pd.to_datetime(df['date'], format='%d-%b-%Y', errors='coerce')
-        
-        # Extract year and month for grouping
-        df['year_month'] = df['date_dt'].dt.to_period('M')
-        df['month_name'] = df['date_dt'].dt.strftime('%Y-%m')
-    except Exception as e:
-        print(f"Error processing dates in monthly timekeeper pivot: {e}")
-        return pd.DataFrame()
-    
-    # Create pivot table for hours
-    hours_pivot = df.pivot_table(
-        index=['matter_no', 'month_name'],
-        columns='timekeeper',
-        values='hours',
-        aggfunc='sum',
-        fill_value=0
-    )
-    
-    # Create pivot table for amounts
-    amount_pivot = df.pivot_table(
-        index=['matter_no', 'month_name'],
-        columns='timekeeper',
-        values='amount',
-        aggfunc='sum',
-        fill_value=0
-    )
+    # Sum hours and amount for each timekeeper within a month and matter, with timekeepers
+    # spread into columns; absent timekeepers get 0
+    tk_wide = df.groupby(['year_month', 'matter_no', 'timekeeper'], sort=False).agg(
+        hours=('hours', 'sum'),
+        amount=('amount', 'sum')
+    ).unstack('timekeeper', fill_value=0)
     
-    # Combine both pivot tables
-    combined_data = []
-    
-    for (matter_no, month_name), group in df.groupby(['month_name', 'matter_no']):
-        # Get matter description (should be the same for all entries with same matter_no)
-        matter_desc = group['matter_description'].iloc[0] if not group['matter_description'].isna().all() else "Not Found"
-        
-        # Calculate total hours and total amount for this matter and month
-        total_hours_all = group['hours'].sum()
-        total_amount_all = group['amount'].sum()
-        
-        row_data = {
-            'Month': month_name,
-            'Matter No': matter_no,
-            'Matter Description': matter_desc,
-            'Total Hours': total_hours_all,  # Sum of all hours
-            'Total Amount': total_amount_all,  # Sum of all amount
-        }
-        
-        # Add hours for each timekeeper
-        for timekeeper in group['timekeeper'].unique():
-            tk_data = group[group['timekeeper'] == timekeeper]
-            total_hours = tk_data['hours'].sum()
-            total_amount = tk_data['amount'].sum()
-            
-            row_data[f'{timekeeper} - Hours'] = total_hours
-            row_data[f'{timekeeper} - Amount'] = total_amount
-        
-        combined_data.append(row_data)
-    
-    combined_df = pd.DataFrame(combined_data)
+    if tk_wide.empty:
+        return pd.DataFrame()
     
-    # Fill NaN values with 0
-    combined_df = combined_df.fillna(0)
+    # Calculate total hours and total amount for each matter and month
+    totals = df.groupby(['year_month', 'matter_no']).agg(**{
+        'Matter Description': ('matter_description', 'first'),
+        'Total Hours': ('hours', 'sum'),  # Sum of all hours
+        'Total Amount': ('amount', 'sum'),  # Sum of all amount
+    })
+    # Get matter description (should be the same for all entries with same matter_no)
+    totals['Matter Description'] = totals['Matter Description'].fillna("Not Found")
+    
+    # Timekeeper columns sorted alphabetically
+    hours_wide = tk_wide['hours'].add_suffix(' - Hours').sort_index(axis=1)
+    amount_wide = tk_wide['amount'].add_suffix(' - Amount').sort_index(axis=1)
+    
+    # Fixed columns, then hours columns, then amount columns
+    combined_df = totals.join(hours_wide).join(amount_wide)
+    combined_df.columns.name = None
+    combined_df = combined_df.rename_axis(['Month', 'Matter No']).reset_index()
+    combined_df['Month'] = combined_df['Month'].dt.strftime('%Y-%m')
     
     # Sort by matter no and month
-    if not combined_df.empty:
-        combined_df = combined_df.sort_values(['Matter No', 'Month'])
-    
-    # Reorder columns to put summary columns after description
-    column_order = ['Month', 'Matter No', 'Matter Description', 'Total Hours', 'Total Amount']
-    
-    # Add timekeeper columns (both hours and amount) after the summary columns
-    timekeeper_columns = [col for col in combined_df.columns if col not in column_order]
-    
-    # Separate hours and amount columns for better ordering
-    hours_columns = [col for col in timekeeper_columns if ' - Hours' in col]
-    amount_columns = [col for col in timekeeper_columns if ' - Amount' in col]
-    
-    # Sort timekeeper columns alphabetically
-    hours_columns.sort()
-    amount_columns.sort()
-    
-    # Create final column order: fixed columns, then hours columns, then amount columns
-    final_column_order = column_order + hours_columns + amount_columns
-    
-    # Reorder the DataFrame columns
-    combined_df = combined_df[final_column_order]
+    combined_df = combined_df.sort_values(['Matter No', 'Month'])
     
     return combined_df
 '''
@@ -709,51 +828,38 @@ def create_monthly_summary(fee_detail_df):
     if fee_detail_df.empty:
         return pd.DataFrame()
     
-    # Create a copy to avoid modifying the original
-    df = fee_detail_df.copy()
-    
-    # Convert date to datetime and extract year-month
-    try:
-        # Handle different date formats
-        df['date_dt'] = pd.to_datetime(df['date'], format='%d-%b-%y', errors='coerce')
-        if df['date_dt'].isna().any():
-            df['date_dt'] = pd.to_datetime(df['date'], format='%d-%b-%Y', errors='coerce')
-        
-        # Extract year and month for grouping
-        df['year_month'] = df['date_dt'].dt.to_period('M')
-        df['month_name'] = df['date_dt'].dt.strftime('%Y-%m')
-        df['month_year'] = df['date_dt'].dt.strftime('%B %Y')  # e.g., "August 2024"
-    except Exception as e:
-        print(f"Error processing dates in monthly summary: {e}")
-        return pd.DataFrame()
-    
-    # Group by month and calculate totals
-    monthly_data = []
-    
-    for month_name, group in df.groupby('month_name'):
-        month_year = group['month_year'].iloc[0] if not group['month_year'].isna().all() else month_name
-        
-        total_hours = group['hours'].sum()
-        total_amount = group['amount'].sum()
-        
-        # Count unique matters and timekeepers
-        unique_matters = group['matter_no'].nunique() if 'matter_no' in group.columns else 0
-        unique_timekeepers = group['timekeeper'].nunique()
-        
-        monthly_data.append({
-            'Month': month_name,
-            'Month Year': month_year,
-            'Total Hours': total_hours,
-            'Total Amount': total_amount,
-            'Number of Matters': unique_matters,
-            'Number of Timekeepers': unique_timekeepers
-        })
+    # Month columns normally come precomputed from enrich_fee_detail
+    if 'year_month' not in fee_detail_df.columns:
+        fee_detail_df = enrich_fee_detail(fee_detail_df)
     
-    monthly_df = pd.DataFrame(monthly_data)
+    # Only read from here on, so no copy is needed
+    df = fee_detail_df
     
-    # Sort by month
-    if not monthly_df.empty:
-        monthly_df = monthly_df.sort_values('Month')
+    # One groupby handle serves every per-month aggregate below
+    by_month = df.groupby('year_month')
+    if by_month.ngroups == 0:
+        return pd.DataFrame()
+    months = by_month.size().index
+    
+    # Sum hours and amount per month in one pass over the arrays, keyed by the group codes;
+    # rows with an unparseable date have no month, so ngroup() gives them NaN, mapped to -1
+    month_codes = by_month.ngroup().fillna(-1).to_numpy(np.intp)
+    total_hours = group_sum(month_codes, df['hours'].to_numpy(dtype=np.float64), by_month.ngroups)
+    total_amount = group_sum(month_codes, df['amount'].to_numpy(dtype=np.float64), by_month.ngroups)
+    
+    # Count unique matters and timekeepers
+    unique_matters = by_month['matter_no'].nunique().to_numpy() if 'matter_no' in df.columns else 0
+    unique_timekeepers = by_month['timekeeper'].nunique().to_numpy()
+    
+    # Sorted by month, as groupby orders its keys
+    monthly_df = pd.DataFrame({
+        'Month': months.strftime('%Y-%m'),
+        'Month Year': months.strftime('%B %Y'),  # e.g., "August 2024"
+        'Total Hours': total_hours,
+        'Total Amount': total_amount,
+        'Number of Matters': unique_matters,
+        'Number of Timekeepers': unique_timekeepers
+    })
     
     # Calculate cumulative totals
     if not monthly_df.empty:
@@ -763,30 +869,57 @@ def create_monthly_summary(fee_detail_df):
     return monthly_df
 
 
-def process_pdf_directory(directory_path):
+def process_pdf_directory(directory_path, workers=None, cache_dir=None):
     """
-    Process all PDF files in the directory and return dataframes
+    Process all PDF files in the directory and return dataframes.
+    workers is the number of worker processes (default: CPU count); 1 processes in-line.
+    With cache_dir, results are stored as Parquet and reused while the PDF files are unchanged
     """
-    all_fee_summary = []
-    all_fee_detail = []
+    pdf_files = find_pdf_files(directory_path)
     
-    pdf_files = list(Path(directory_path).glob('*.pdf'))
+    logger.info("Found %d PDF files to process...", len(pdf_files))
     
-    print(f"Found {len(pdf_files)} PDF files to process...")
-    
-    for pdf_file in pdf_files:
-        print(f"Processing: {pdf_file.name}")
-        fee_summary, fee_detail = extract_invoice_data(pdf_file)
+    return cached_frames(cache_dir, pdf_files, lambda: _extract_pdf_files(pdf_files, workers))
+
+def _extract_pdf_files(pdf_files, workers):
+    """
+    Extract and combine the fee summary and fee detail dataframes of pdf_files
+    """
+    # Row lists per file; chained into one frame each at the end
+    fee_summary_parts = []
+    fee_detail_parts = []
+    
+    # Text extraction is CPU-bound and independent per file, so it runs in worker processes
+    results = iter_in_order(extract_invoice_data, pdf_files, workers=workers,
+                            log_level=logger.getEffectiveLevel())
+    for pdf_file, (fee_summary, fee_detail) in zip(pdf_files, results):
+        logger.info("Processing: %s", pdf_file.name)
         
         if fee_summary:
-            all_fee_summary.extend(fee_summary)
+            fee_summary_parts.append(fee_summary)
         
         if fee_detail:
-            all_fee_detail.extend(fee_detail)
+            fee_detail_parts.append(fee_detail)
     
     # Create dataframes
-    fee_summary_df = pd.DataFrame(all_fee_summary) if all_fee_summary else pd.DataFrame()
-    fee_detail_df = pd.DataFrame(all_fee_detail) if all_fee_detail else pd.DataFrame()
+    fee_summary_df = (
+        pd.DataFrame.from_records(itertools.chain.from_iterable(fee_summary_parts), columns=FEE_SUMMARY_COLUMNS)
+        if fee_summary_parts else pd.DataFrame()
+    )
+    fee_detail_df = (
+        pd.DataFrame.from_records(itertools.chain.from_iterable(fee_detail_parts), columns=FEE_DETAIL_COLUMNS)
+        .astype(FEE_DETAIL_DTYPES)
+        if fee_detail_parts else pd.DataFrame()
+    )
+    
+    # Convert date format from "dd-mmm-yy" to "dd-mm-yyyy" in one pass over the column
+    if not fee_detail_df.empty:
+        date_dt = parse_fee_detail_dates(fee_detail_df['date'])
+        for date_str in fee_detail_df.loc[date_dt.isna(), 'date']:
+            logger.warning("Warning: Could not parse date: %s", date_str)
+        # If parsing fails, keep original date
+        formatted_date = date_dt.dt.strftime('%d-%m-%Y').fillna(fee_detail_df['date'])
+        fee_detail_df.insert(fee_detail_df.columns.get_loc('date') + 1, 'date_', formatted_date)
     
     # Add rate and amount to fee detail
     if not fee_detail_df.empty and not fee_summary_df.empty:
@@ -794,74 +927,93 @@ def process_pdf_directory(directory_path):
     
     return fee_summary_df, fee_detail_df
 
+# Above this many Fee Detail rows, write the workbook with pyexcelerate when it is installed
+PYEXCELERATE_MIN_ROWS = 5000
+
+def _iter_sheets(fee_summary_df, fee_detail_df):
+    """
+    Yield (sheet name, DataFrame) for each output sheet, with a message frame for missing data
+    """
+    # Parse dates once for all of the monthly sheets
+    monthly_df = enrich_fee_detail(fee_detail_df) if not fee_detail_df.empty else fee_detail_df
+    has_detail = not fee_detail_df.empty
+    
+    # (sheet name, whether its input exists, builder, saved message,
+    #  message when the input is missing, message when the builder returns nothing)
+    sheets = [
+        ('Fee Summary', not fee_summary_df.empty, lambda: fee_summary_df,
+         "Saved %d fee summary entries",
+         'No fee summary data found.', 'No fee summary data found.'),
+        ('Fee Detail', has_detail, lambda: fee_detail_df,
+         "Saved %d fee detail entries",
+         'No fee detail data found.', 'No fee detail data found.'),
+        ('Task by Month', has_detail and 'task_category' in fee_detail_df.columns,
+         lambda: create_monthly_task_pivot(monthly_df),
+         "Saved Task by Month pivot table with %d entries",
+         'No fee detail data available for pivot table.', 'Could not create pivot table from fee detail data.'),
+        ('Monthly Summary', has_detail, lambda: create_monthly_summary(monthly_df),
+         "Saved monthly summary with %d entries",
+         'No fee detail data available for monthly summary.', 'Could not create monthly summary.'),
+        ('Monthly Timekeeper', has_detail and not fee_summary_df.empty,
+         lambda: create_monthly_timekeeper_pivot(monthly_df, fee_summary_df),
+         "Saved Monthly Timekeeper pivot table with %d entries",
+         'No data available for monthly timekeeper pivot table.', 'Could not create monthly timekeeper pivot table.'),
+    ]
+    
+    for sheet_name, available, build, saved_message, missing_message, empty_message in sheets:
+        # Builders only run when their input exists
+        df = build() if available else None
+        if df is not None and not df.empty:
+            yield sheet_name, df
+            logger.info(saved_message, len(df))
+        else:
+            # Create sheet with message
+            message = empty_message if available else missing_message
+            yield sheet_name, pd.DataFrame({'Message': [message]})
+
+def _save_with_pyexcelerate(sheets, output_path):
+    """
+    Write all sheets with pyexcelerate, which builds the XML with far less per-cell Python
+    """
+    workbook = pyexcelerate.Workbook()
+    header_style = pyexcelerate.Style(font=pyexcelerate.Font(bold=True))
+    for sheet_name, df in sheets:
+        # Excel has no NaN; blank cells are what to_excel writes for missing values
+        values = df.astype(object).where(df.notna(), None).to_numpy().tolist()
+        worksheet = workbook.new_sheet(sheet_name, data=[list(df.columns)] + values)
+        worksheet.set_row_style(1, header_style)
+    workbook.save(output_path)
+
 def save_to_excel(fee_summary_df, fee_detail_df, output_path):
     """
     Save data to Excel file with multiple sheets
     """
     # Check if we have any data to save
     if fee_summary_df.empty and fee_detail_df.empty:
-        print("No data to save. Creating empty Excel file with message.")
+        logger.warning("No data to save. Creating empty Excel file with message.")
         # Create a minimal DataFrame with a message
         message_df = pd.DataFrame({'Message': ['No invoice data was extracted from the PDF files.']})
-        message_df.to_excel(output_path, sheet_name='No Data', index=False)
+        message_df.to_excel(output_path, sheet_name='No Data', index=False, engine=EXCEL_ENGINE)
         return
     
-    with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
-        # Save Fee Summary sheet
-        if not fee_summary_df.empty:
-            fee_summary_df.to_excel(writer, sheet_name='Fee Summary', index=False)
-            print(f"Saved {len(fee_summary_df)} fee summary entries")
-        else:
-            # Create empty sheet with message
-            empty_summary_df = pd.DataFrame({'Message': ['No fee summary data found.']})
-            empty_summary_df.to_excel(writer, sheet_name='Fee Summary', index=False)
-        
-        # Save Fee Detail sheet
-        if not fee_detail_df.empty:
-            fee_detail_df.to_excel(writer, sheet_name='Fee Detail', index=False)
-            print(f"Saved {len(fee_detail_df)} fee detail entries")
-        else:
-            # Create empty sheet with message
-            empty_detail_df = pd.DataFrame({'Message': ['No fee detail data found.']})
-            empty_detail_df.to_excel(writer, sheet_name='Fee Detail', index=False)
-        
-        # Create and save Task by Month pivot table
-        if not fee_detail_df.empty and 'task_category' in fee_detail_df.columns:
-            pivot_df = create_monthly_task_pivot(fee_detail_df)
-            if not pivot_df.empty:
-                pivot_df.to_excel(writer, sheet_name='Task by Month', index=False)
-                print(f"Saved Task by Month pivot table with {len(pivot_df)} entries")
-            else:
-                empty_pivot_df = pd.DataFrame({'Message': ['Could not create pivot table from fee detail data.']})
-                empty_pivot_df.to_excel(writer, sheet_name='Task by Month', index=False)
-        else:
-            empty_pivot_df = pd.DataFrame({'Message': ['No fee detail data available for pivot table.']})
-            empty_pivot_df.to_excel(writer, sheet_name='Task by Month', index=False)
-        
-        # Create and save Monthly Summary sheet
-        if not fee_detail_df.empty:
-            monthly_summary_df = create_monthly_summary(fee_detail_df)
-            if not monthly_summary_df.empty:
-                monthly_summary_df.to_excel(writer, sheet_name='Monthly Summary', index=False)
-                print(f"Saved monthly summary with {len(monthly_summary_df)} entries")
-            else:
-                empty_monthly_df = pd.DataFrame({'Message': ['Could not create monthly summary.']})
-                empty_monthly_df.to_excel(writer, sheet_name='Monthly Summary', index=False) 
-
-        # Create and save Monthly Timekeeper pivot table
-        if not fee_detail_df.empty and not fee_summary_df.empty:
-            timekeeper_pivot_df = create_monthly_timekeeper_pivot(fee_detail_df, fee_summary_df)
-            if not timekeeper_pivot_df.empty:
-                timekeeper_pivot_df.to_excel(writer, sheet_name='Monthly Timekeeper', index=False)
-                print(f"Saved Monthly Timekeeper pivot table with {len(timekeeper_pivot_df)} entries")
-            else:
-                empty_timekeeper_pivot = pd.DataFrame({'Message': ['Could not create monthly timekeeper pivot table.']})
-                empty_timekeeper_pivot.to_excel(writer, sheet_name='Monthly Timekeeper', index=False)
-        else:
-            empty_timekeeper_pivot = pd.DataFrame({'Message': ['No data available for monthly timekeeper pivot table.']})
-            empty_timekeeper_pivot.to_excel(writer, sheet_name='Monthly Timekeeper', index=False)
+    sheets = _iter_sheets(fee_summary_df, fee_detail_df)
+    
+    # A large Fee Detail sheet dominates the write; copying one sheet between workbooks
+    # would cost more than it saves, so pyexcelerate writes the whole workbook instead
+    if pyexcelerate is not None and len(fee_detail_df) > PYEXCELERATE_MIN_ROWS:
+        _save_with_pyexcelerate(sheets, output_path)
+        logger.info("Data saved to: %s", output_path)
+        return
     
-    print(f"Data saved to: {output_path}")
+    # Every sheet goes through write_sheet, which writes strictly row by row, so both
+    # engines can stream: finished rows are flushed to disk instead of held per sheet
+    engine_kwargs = streaming_engine_kwargs()
+    
+    with pd.ExcelWriter(output_path, engine=EXCEL_ENGINE, engine_kwargs=engine_kwargs) as writer:
+        for sheet_name, df in sheets:
+            write_sheet(writer, df, sheet_name)
+    
+    logger.info("Data saved to: %s", output_path)
 
 def analyze_task_categories(fee_detail_df):
     """
@@ -869,10 +1021,11 @@ def analyze_task_categories(fee_detail_df):
     """
     if not fee_detail_df.empty and 'task_category' in fee_detail_df.columns:
         print("\nTask Category Summary:")
-        category_summary = fee_detail_df.groupby('task_category').agg({
-            'hours': 'sum',
-            'amount': 'sum'
-        }).round(2)
+        # Group order is irrelevant here; only the output is sorted, by hours
+        category_summary = fee_detail_df.groupby('task_category', observed=True, sort=False).agg(
+            hours=('hours', 'sum'),
+            amount=('amount', 'sum')
+        ).round(2)
         
         category_summary = category_summary.sort_values('hours', ascending=False)
         print(category_summary)
@@ -889,16 +1042,31 @@ def main():
     # Output Excel file
     output_excel = "invoice_data_analysis.xlsx"
     
+    parser = argparse.ArgumentParser(description="Extract fee summary and fee detail data from invoice PDFs")
+    parser.add_argument('--directory', default=pdf_directory,
+                        help="directory containing the invoice PDF files")
+    parser.add_argument('--workers', type=positive_int, default=os.cpu_count(),
+                        help="number of worker processes for PDF extraction (1 runs sequentially)")
+    parser.add_argument('--output', default=output_excel,
+                        help="path of the Excel file to write")
+    parser.add_argument('--cache-dir', default=None,
+                        help="reuse extracted data cached here as Parquet while the PDF files are unchanged")
+    args = parser.parse_args()
+    
+    # Progress and diagnostics go through logging; the report below is printed as before
+    logging.basicConfig(level=logging.INFO, format='%(message)s', stream=sys.stdout)
+    
     try:
         # Process all PDF files
-        fee_summary_df, fee_detail_df = process_pdf_directory(pdf_directory)
+        fee_summary_df, fee_detail_df = process_pdf_directory(args.directory, workers=args.workers,
+                                                              cache_dir=args.cache_dir)
         
         # Analyze task categories
         if not fee_detail_df.empty:
             analyze_task_categories(fee_detail_df)
         
         # Save to Excel
-        save_to_excel(fee_summary_df, fee_detail_df, output_excel)
+        save_to_excel(fee_summary_df, fee_detail_df, args.output)
         
         # Print summary
         print(f"\nProcessing complete!")
@@ -918,9 +1086,7 @@ def main():
             print(f"Fee Detail columns: {list(fee_detail_df.columns)}")
             
     except Exception as e:
-        print(f"Error in main process: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error in main process: %s", e)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
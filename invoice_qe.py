@@ -1,76 +1,147 @@
 import os
 import re
+import sys
+import argparse
+import logging
+import numpy as np
 import pandas as pd
 import PyPDF2
-from pathlib import Path
-from nltk.stem import PorterStemmer
-import nltk
-from datetime import datetime
-
-# Download required NLTK data
 try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    print("Downloading NLTK punkt tokenizer...")
-    nltk.download('punkt')
-
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
 try:
-    nltk.data.find('tokenizers/punkt_tab')
-except LookupError:
-    print("Downloading NLTK punkt_tab tokenizer...")
-    nltk.download('punkt_tab')
-
-# Initialize stemmer
-stemmer = PorterStemmer()
+    # pypdf is PyPDF2's maintained successor, with a faster content-stream parser
+    import pypdf
+except ImportError:
+    pypdf = None
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+try:
+    import pypdfium2 as pdfium
+except ImportError:
+    pdfium = None
+from pdf_batch import iter_in_order, positive_int, find_pdf_files, cached_frames
+from excel_sheets import EXCEL_ENGINE, streaming_engine_kwargs, write_sheet
+
+logger = logging.getLogger(__name__)
+
+# Patterns used by the extract_quinn_* helpers, compiled once at import
+# First date in the format "15 October 2025"
+_INVOICE_DATE_RE = re.compile(r'(\d{1,2}\s+[A-Za-z]+\s+\d{4})')
+_INVOICE_NO_PATTERNS = [re.compile(p, re.IGNORECASE) for p in (
+    r'Invoice No:\s*([A-Za-z0-9\-]+)',
+    r'Invoice Number:\s*([A-Za-z0-9\-]+)',
+    r'Invoice\s*#?\s*([A-Za-z0-9\-]+)',
+)]
+_MATTER_NO_PATTERNS = [re.compile(p, re.IGNORECASE) for p in (
+    r'Matter No:\s*([A-Za-z0-9.\-]+)',
+    r'Our Matter No\.?\s*([A-Za-z0-9.\-]+)',
+    r'Matter Number:\s*([A-Za-z0-9.\-]+)',
+)]
+_CLIENT_MATTER_PATTERNS = [re.compile(p, re.IGNORECASE) for p in (
+    r'Matter No:.*?\n.*?\n(.*?)(?:\n|$)',
+    r'Maxeon/Maoxing v Aiko',
+    r'Responsible Attorney.*?\n(.*?)(?:\n|$)'
+)]
+# Sections are sliced out between start and end markers
+_FEE_SUMMARY_START_PATTERNS = [re.compile(p, re.IGNORECASE) for p in (
+    'Fee Summary',
+    # Fall back to the table header
+    r'Attorneys\s+Init\.?\s+Title\s+Hours\s+Rate\s+Amount',
+)]
+_FEE_SUMMARY_END = re.compile('Total Hours|Statement Detail', re.IGNORECASE)
+# "Johannes Bukow JB6 Partner 40,20 1.225,00 49.245,00" (titles may be several words)
+# Scanned over the whole section, so whitespace is [^\S\n] to keep every match on one line
+_FEE_SUMMARY_ROW_RE = re.compile(r'^[^\S\n]*([A-Za-z]+(?:[^\S\n]+[A-Za-z]+)+)[^\S\n]+([A-Z0-9]+)[^\S\n]+([A-Za-z]+(?:[^\S\n]+[A-Za-z]+)*?)[^\S\n]+([\d.,]+)[^\S\n]+([\d.,]+)[^\S\n]+([\d.,]+)[^\S\n]*$', re.MULTILINE)
+_FEE_DETAIL_START = re.compile(r'Date\s+Timekeeper\s+Description\s+Hours', re.IGNORECASE)
+_FEE_DETAIL_END = re.compile(r'Total Hours\s+\d+[,.]\d{2}|Fee Summary', re.IGNORECASE)
+# Page footer plus the repeated table header on the next page
+_QUINN_HEADER_RE = re.compile(r'\squinn\s+emanuel\s*[|]\s*germany.*?Date\s*Timekeeper\s*Description\s*Hours', re.IGNORECASE | re.DOTALL)
+# Stripped from the whole section, so whitespace is [^\S\n] to match within one line only
+_QUINN_FOOTER_RE = re.compile(r'quinn[^\S\n]+emanuel[^\S\n]+\|[^\S\n]+germany')
+# Tokenizes the fee detail section one line per match: the stripped line, made of an
+# optional "11/07/25 JB6 " entry start, the text, and optional hours at the very end.
+# The text group never has leading or trailing whitespace, so it needs no strip().
+# Scanned over the whole section, so whitespace is [^\S\n] to keep every match on one line
+_DETAIL_LINE_RE = re.compile(r'^[^\S\n]*(?P<line>(?:(?P<date>\d{2}/\d{2}/\d{2})[^\S\n]+(?P<timekeeper>[A-Z0-9]{2,})[^\S\n]+(?=\S))?(?P<text>.*?)(?:[^\S\n]*(?P<hours>\d+[,.]\d+))?)[^\S\n]*$', re.MULTILINE)
+
+# The extractors return plain row tuples in these column orders
+QUINN_FEE_SUMMARY_COLUMNS = ['pdf_filename', 'date_of_invoice', 'invoice_no', 'matter_no', 'client_matter',
+                             'lawyer_name', 'initials', 'title', 'hours', 'rate', 'amount']
+# Fee detail hours stay raw strings in the rows; process_quinn_pdf_directory converts the
+# whole column at once and adds amount after title
+QUINN_FEE_DETAIL_COLUMNS = ['pdf_filename', 'date', 'timekeeper', 'hours', 'description',
+                            'rate', 'lawyer_name', 'title']
+
+# (rate, lawyer_name, title) for timekeepers missing from the fee summary
+_UNKNOWN_RATE_INFO = (0.0, 'Unknown', 'Unknown')
+
+# European number separators: dots group thousands, the comma is the decimal point
+_EUROPEAN_NUMBER_TABLE = str.maketrans({'.': '', ',': '.'})
+_EUROPEAN_HOURS_TABLE = str.maketrans({',': '.'})
+
+# Fee detail lines containing any of these are page furniture, not entries
+SKIP_PHRASES = (
+    ' | ',
+    'Invoice No:',
+    'Matter No:',
+    'Quinn Emanuel Urquhart',
+    '201996011004, with headquarters located',
+    'laws of the State of California.',
+    'employee or consultant with an equivalent status',
+    'referred to as partners while not belonging to the partnership',
+    'Date Timekeeper Description Hours',
+)
+
+if ahocorasick is not None:
+    # One automaton pass per line finds any skip phrase, however many there are
+    _SKIP_AC = ahocorasick.Automaton()
+    for phrase in SKIP_PHRASES:
+        _SKIP_AC.add_word(phrase, phrase)
+    _SKIP_AC.make_automaton()
+
+    def _is_skip_line(line):
+        return next(_SKIP_AC.iter(line), None) is not None
+else:
+    # Without pyahocorasick, one alternation still scans each line once in C
+    _SKIP_RE = re.compile('|'.join(map(re.escape, SKIP_PHRASES)))
+
+    def _is_skip_line(line):
+        return _SKIP_RE.search(line) is not None
 
 def extract_quinn_invoice_date(text):
     """Extract invoice date from Quinn Emanuel text - first date in dd Month yyyy format"""
-    # Look for the first date in the format "15 October 2025"
-    date_pattern = r'(\d{1,2}\s+[A-Za-z]+\s+\d{4})'
-    matches = re.findall(date_pattern, text)
+    match = _INVOICE_DATE_RE.search(text)
     
-    if matches:
-        return matches[0]  # Return the first date found
+    if match:
+        return match.group(1)  # Return the first date found
     return "Not Found"
 
 def extract_quinn_invoice_no(text):
     """Extract invoice number from Quinn Emanuel text"""
-    patterns = [
-        r'Invoice No:\s*([A-Za-z0-9\-]+)',
-        r'Invoice Number:\s*([A-Za-z0-9\-]+)',
-        r'Invoice\s*#?\s*([A-Za-z0-9\-]+)',
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
+    for pattern in _INVOICE_NO_PATTERNS:
+        match = pattern.search(text)
         if match:
             return match.group(1)
     return "Not Found"
 
 def extract_quinn_matter_no(text):
     """Extract matter number from Quinn Emanuel text"""
-    patterns = [
-        r'Matter No:\s*([A-Za-z0-9.\-]+)',
-        r'Our Matter No\.?\s*([A-Za-z0-9.\-]+)',
-        r'Matter Number:\s*([A-Za-z0-9.\-]+)',
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
+    for pattern in _MATTER_NO_PATTERNS:
+        match = pattern.search(text)
         if match:
             return match.group(1)
     return "Not Found"
 
 def extract_quinn_client_matter(text):
     """Extract client/matter description from Quinn Emanuel text"""
-    patterns = [
-        r'Matter No:.*?\n.*?\n(.*?)(?:\n|$)',
-        r'Maxeon/Maoxing v Aiko',
-        r'Responsible Attorney.*?\n(.*?)(?:\n|$)'
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
+    for pattern in _CLIENT_MATTER_PATTERNS:
+        match = pattern.search(text)
         if match:
             return match.group(1).strip()
     return "Not Found"
@@ -78,10 +149,9 @@ def extract_quinn_client_matter(text):
 def parse_european_number(number_str):
     """Parse European number format (1.225,00 -> 1225.00)"""
     try:
-        # Remove dots (thousand separators) and replace comma (decimal) with dot
-        cleaned = number_str.replace('.', '').replace(',', '.')
-        return float(cleaned)
-    except:
+        # Remove dots (thousand separators) and replace comma (decimal) with dot, in one pass
+        return float(number_str.translate(_EUROPEAN_NUMBER_TABLE))
+    except (ValueError, AttributeError):
         return 0.0
 
 def parse_european_hours(hours_str):
@@ -89,9 +159,9 @@ def parse_european_hours(hours_str):
     try:
         # For hours, we just need to replace comma with dot
         # Hours don't typically have thousand separators
-        return float(hours_str.replace(',', '.'))
-    except:
-        print(f"Warning: Could not parse hours value: {hours_str}")
+        return float(hours_str.translate(_EUROPEAN_HOURS_TABLE))
+    except (ValueError, AttributeError):
+        logger.warning("Could not parse hours value: %s", hours_str)
         return 0.0
 
 def extract_quinn_fee_summary(text, filename, invoice_date, invoice_no, matter_no, client_matter):
@@ -103,282 +173,142 @@ def extract_quinn_fee_summary(text, filename, invoice_date, invoice_no, matter_n
     fee_summary_data = []
     
     # Find the Fee Summary section
-    fee_summary_match = re.search(r'Fee Summary(.*?)(?=Total Hours|Statement Detail|$)', text, re.IGNORECASE | re.DOTALL)
-    
-    if not fee_summary_match:
-        # Try to find the table by header pattern
-        fee_summary_match = re.search(r'Attorneys\s+Init\.?\s+Title\s+Hours\s+Rate\s+Amount(.*?)(?=Total Hours|Statement Detail|$)', text, re.IGNORECASE | re.DOTALL)
+    fee_summary_match = None
+    for pattern in _FEE_SUMMARY_START_PATTERNS:
+        fee_summary_match = pattern.search(text)
+        if fee_summary_match:
+            break
     
     if fee_summary_match:
-        fee_summary_text = fee_summary_match.group(1)
-        print(f"Found Fee Summary section: {fee_summary_text[:500]}...")  # Debug
+        start = fee_summary_match.end()
+        end_match = _FEE_SUMMARY_END.search(text, start)
+        fee_summary_text = text[start:end_match.start() if end_match else None]
+        logger.debug("Found Fee Summary section: %s...", fee_summary_text[:500])
+        # Checked once; the per-row debug call and its arguments are skipped unless enabled
+        debug = logger.isEnabledFor(logging.DEBUG)
         
-        # More flexible pattern for Quinn Emanuel fee summary lines
-        # "Johannes Bukow JB6 Partner 40,20 1.225,00 49.245,00"
-        patterns = [
-            r'^([A-Za-z]+(?:\s+[A-Za-z]+)+)\s+([A-Z0-9]+)\s+([A-Za-z]+)\s+([\d.,]+)\s+([\d.,]+)\s+([\d.,]+)$',
-            r'^([A-Za-z]+(?:\s+[A-Za-z]+)+)\s+([A-Z0-9]+)\s+([A-Za-z\s]+?)\s+([\d.,]+)\s+([\d.,]+)\s+([\d.,]+)$',
-        ]
-        
-        lines = fee_summary_text.split('\n')
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-                
-            print(f"Processing fee summary line: '{line}'")  # Debug
+        for match in _FEE_SUMMARY_ROW_RE.finditer(fee_summary_text):
+            lawyer_name, initials, title, hours_str, rate_str, amount_str = match.groups()
+            # The same few names, initials and titles repeat on every invoice; intern them so
+            # rows share one object each and the initials lookups compare by identity first
+            lawyer_name, initials, title = sys.intern(lawyer_name), sys.intern(initials), sys.intern(title)
             
-            parsed = False
-            for pattern in patterns:
-                match = re.match(pattern, line)
-                if match:
-                    lawyer_name = match.group(1).strip()
-                    initials = match.group(2).strip()
-                    title = match.group(3).strip()
-                    hours_str = match.group(4).strip()
-                    rate_str = match.group(5).strip()
-                    amount_str = match.group(6).strip()
-                    
-                    # Parse European number formats
-                    hours = parse_european_hours(hours_str)
-                    rate = parse_european_number(rate_str)
-                    amount = parse_european_number(amount_str)
-                    
-                    fee_summary_data.append({
-                        'pdf_filename': filename,
-                        'date_of_invoice': invoice_date,
-                        'invoice_no': invoice_no,
-                        'matter_no': matter_no,
-                        'client_matter': client_matter,
-                        'lawyer_name': lawyer_name,
-                        'initials': initials,
-                        'title': title,
-                        'hours': hours,
-                        'rate': rate,
-                        'amount': amount
-                    })
-                    print(f"Successfully parsed: {lawyer_name} - {hours} hours at rate {rate}")  # Debug
-                    parsed = True
-                    break
+            # Parse European number formats
+            hours = parse_european_hours(hours_str)
+            rate = parse_european_number(rate_str)
+            amount = parse_european_number(amount_str)
             
-            if not parsed:
-                print(f"Warning: Could not parse fee summary line: '{line}'")
+            fee_summary_data.append((filename, invoice_date, invoice_no, matter_no, client_matter,
+                                     lawyer_name, initials, title, hours, rate, amount))
+            if debug:
+                logger.debug("Successfully parsed: %s - %s hours at rate %s", lawyer_name, hours, rate)
+        
+        if not fee_summary_data:
+            logger.warning("No fee summary lines could be parsed")
     
     else:
-        print("Warning: Could not find Fee Summary section")
+        logger.warning("Could not find Fee Summary section")
     
     return fee_summary_data
 
 def extract_quinn_fee_detail(text, filename, fee_summary_data):
     """
-    Extract fee detail data from Quinn Emanuel text - Statement Detail section
+    Extract fee detail data from Quinn Emanuel text - Statement Detail section.
+    hours is left as the raw "0,50" string so the column can be converted in one pass
     """
     fee_detail_data = []
     
-    # Create a mapping
-    timekeeper_rate_map = {}
-    for summary in fee_summary_data:
-        timekeeper_rate_map[summary['initials']] = {
-            'rate': summary['rate'],
-            'lawyer_name': summary['lawyer_name'],
-            'title': summary['title']
-        }
-    print(f"Created timekeeper rate map: {timekeeper_rate_map}")  # Debug
+    # Map initials to (rate, lawyer_name, title)
+    timekeeper_rate_map = {
+        initials: (rate, lawyer_name, title)
+        for _, _, _, _, _, lawyer_name, initials, title, _, rate, _ in fee_summary_data
+    }
+    logger.debug("Created timekeeper rate map: %s", timekeeper_rate_map)
 
-    # Find Statement Detail section
-    #fee_detail_match = re.search(r'Statement Detail(.*?)(?=Total Hours\s+\d+[,.]\d{2}|Fee Summary|\Z)', text, re.IGNORECASE | re.DOTALL)
-    
-    #if not fee_detail_match:
-        # Try alternative pattern
-    fee_detail_match = re.search(r'Date\s+Timekeeper\s+Description\s+Hours(.*?)(?=Total Hours\s+\d+[,.]\d{2}|Fee Summary|\Z)', text, re.IGNORECASE | re.DOTALL)
+    # Find Statement Detail section by its table header
+    fee_detail_match = _FEE_DETAIL_START.search(text)
     
     if fee_detail_match:
-        fee_detail_text = fee_detail_match.group(1)
-        print(f"Found Fee Detail section, length: {len(fee_detail_text)}")  # Debug
+        start = fee_detail_match.end()
+        end_match = _FEE_DETAIL_END.search(text, start)
+        fee_detail_text = text[start:end_match.start() if end_match else None]
+        logger.debug("Found Fee Detail section, length: %d", len(fee_detail_text))
         
-        #fee_detail_text = re.sub(r'\d{1,2}\s+[A-Za-z]+\s+\d{4}', '', fee_detail_text)
-
-        #fee_detail_text = re.sub(r'quinn\s+emanuel\s+\|\s+germany.*Date Timekeeper Description Hours', '', fee_detail_text)
-        fee_detail_text = re.sub(r'\squinn\s+emanuel\s*[|]\s*germany.*?Date\s*Timekeeper\s*Description\s*Hours', '', fee_detail_text, flags=re.IGNORECASE | re.DOTALL)
-        print(f"Text: {(fee_detail_text)}")
+        fee_detail_text = _QUINN_HEADER_RE.sub('', fee_detail_text)
+        fee_detail_text = _QUINN_FOOTER_RE.sub('', fee_detail_text)
+        logger.debug("Text: %s", fee_detail_text)
 
-        lines = fee_detail_text.split('\n')
         current_entry = None
         current_description = []
         in_multi_line_entry = False  # Flag to track multi-line entry state
+        # Everything the loop calls per line is bound to a local once, so each use is a
+        # fast local load instead of a global or attribute lookup
+        add_row = fee_detail_data.append
+        get_rate_info = timekeeper_rate_map.get
+        is_skip_line = _is_skip_line
+        # Checked once; the per-line debug calls and their slicing are skipped unless enabled
+        debug = logger.isEnabledFor(logging.DEBUG)
         
-        for i, line in enumerate(lines):
-            line = re.sub(r'quinn\s+emanuel\s+\|\s+germany', '', line)
-            line = line.strip()
+        # One match per line; the regex classifies it as entry start, hours end or continuation
+        for line_match in _DETAIL_LINE_RE.finditer(fee_detail_text):
+            line = line_match.group('line')
             
-            if not line or ' | ' in line or 'Invoice No:' in line or 'Matter No:' in line or \
-                'Quinn Emanuel Urquhart' in line or '201996011004, with headquarters located' in line or 'laws of the State of California.' in line or \
-                'employee or consultant with an equivalent status' in line or 'referred to as partners while not belonging to the partnership' in line or \
-                'Date Timekeeper Description Hours' in line:
+            if not line or is_skip_line(line):
                 continue
-            #print(f">>>{line}")    
-            # Skip header lines
-            #if any(header in line.lower() for header in ['date', 'timekeeper', 'description', 'hours']):
-            #    continue
             
-            # Check if this line starts with a date pattern (DD/MM/YY)
-            #line ='11/07/25 JB6 Review patent EP 627; update call with German team; summarizing questions and correspondence with client about'
-            date_match = re.match(r'^(\d{2}/\d{2}/\d{2})[\s]+([A-Z0-9]{2,})\s+(.*)', line)
-            #date_match = re.match(r'^\d{2}/\d{2}/\d{2}', date)
-            print(date_match)
-            if date_match:
+            # Check if this line starts with a date pattern (DD/MM/YY) and/or ends with hours
+            date, hours_str = line_match.group('date', 'hours')
+            if debug:
+                logger.debug("%s", line_match)
+            if date:
                 
-                # Save previous entry if exists
-                if current_entry and current_description:
-                    # Join the accumulated description lines and look for hours at the end
-                    full_description = ' '.join(current_description)
-                    print(f"DEBUG: Processing accumulated description: {full_description}")
-                    #hours_match = re.search(r'(\d+[,.]\d+$)', full_description)
-                    hours_match = re.search(r'(\d+[,.]\d+)', full_description)
+                # Entries are completed as soon as a line ends with hours, so one still
+                # open here never had any; drop it instead of guessing from its text
+                if current_entry is not None:
+                    logger.warning("No hours found for entry: %s %s %s", current_entry[0], current_entry[1], ' '.join(current_description))
 
-                    if hours_match:
-                        hours_str = hours_match.group(1)
-                        description = full_description[:hours_match.start()].strip()
-                        current_entry['hours'] = parse_european_hours(hours_str)
-                        current_entry['description'] = description
-
-                        # Look up rate from fee summary based on timekeeper
-                        timekeeper = current_entry['timekeeper']
-                        rate_info = timekeeper_rate_map.get(timekeeper, {})
-                        rate = rate_info.get('rate', 0.0)
-                        lawyer_name = rate_info.get('lawyer_name', 'Unknown')
-                        title = rate_info.get('title', 'Unknown')
-                        
-                        # Calculate amount
-                        amount = hours * rate
-                        
-                        current_entry.update({
-                            'hours': current_entry['hours'],
-                            'description': description,
-                            'rate': rate,
-                            'lawyer_name': lawyer_name,
-                            'title': title,
-                            'amount': amount
-                        })
-
-                        fee_detail_data.append(current_entry)
-                        print(f"Completed multi-line entry: {current_entry['date']} {current_entry['timekeeper']} {current_entry['hours']}h at rate {rate} = {amount}")
-                    else:
-                        hours_match = re.search(r'(\d+[,.]\d+)$', full_description) #try again to catch full line
-                        if hours_match:
-                            hours_str = hours_match.group(1)
-                            description = full_description[:hours_match.start()].strip()
-                            current_entry['hours'] = parse_european_hours(hours_str)
-                            current_entry['description'] = description
-
-                            # Look up rate from fee summary based on timekeeper
-                            timekeeper = current_entry['timekeeper']
-                            rate_info = timekeeper_rate_map.get(timekeeper, {})
-                            rate = rate_info.get('rate', 0.0)
-                            lawyer_name = rate_info.get('lawyer_name', 'Unknown')
-                            title = rate_info.get('title', 'Unknown')
-                            
-                            # Calculate amount
-                            amount = hours * rate
-                            
-                            current_entry.update({
-                                'hours': current_entry['hours'],
-                                'description': current_entry['description'],
-                                'rate': rate,
-                                'lawyer_name': lawyer_name,
-                                'title': title,
-                                'amount': amount
-                            })
-
-                            fee_detail_data.append(current_entry)
-                            print(f"Last line entry: {current_entry['date']} {current_entry['timekeeper']} {current_entry['hours']}h at rate {rate} = {amount}")
-                        else:
-                            print(f"WARNING: No hours found for entry: {current_entry['date']} {current_entry['timekeeper']} {full_description}")
-
-                
                 # Start new entry
-                date = date_match.group(1)
-                timekeeper = date_match.group(2).strip()
-                rest_of_line = date_match.group(3).strip()
-                #rest_of_line = line[len(date) + len(timekeeper) + 2:]
+                timekeeper = sys.intern(line_match.group('timekeeper'))
+                description = line_match.group('text')
 
                 # Look up rate from fee summary based on timekeeper
-                rate_info = timekeeper_rate_map.get(timekeeper, {})
-                rate = rate_info.get('rate', 0.0)
-                lawyer_name = rate_info.get('lawyer_name', 'Unknown')
-                title = rate_info.get('title', 'Unknown')
+                rate, lawyer_name, title = get_rate_info(timekeeper, _UNKNOWN_RATE_INFO)
 
                 # Check if this line already contains hours
-                hours_match = re.search(r'(\d+[,.]\d+)$', rest_of_line)
-                if hours_match:
+                if hours_str:
                     # Single line entry with hours
-                    hours_str = hours_match.group(1)
-                    description = rest_of_line[:hours_match.start()].strip()
-                    hours = parse_european_hours(hours_str)
-
-                    # Calculate amount
-                    amount = hours * rate
-
-                    entry = {
-                        'pdf_filename': filename,
-                        'date': date,
-                        'timekeeper': timekeeper,
-                        'hours': hours,
-                        'description': description,
-                        'rate': rate,
-                        'lawyer_name': lawyer_name,
-                        'title': title,
-                        'amount': amount
-                    }
-                    fee_detail_data.append(entry)
+                    add_row((filename, date, timekeeper, hours_str, description,
+                             rate, lawyer_name, title))
                     current_entry = None
                     current_description = []
                     in_multi_line_entry = False  # Reset flag
-                    print(f"Parsed single-line entry: {date} {timekeeper} {hours}h at rate {rate} = {amount} - {description[:50]}...")
+                    if debug:
+                        logger.debug("Parsed single-line entry: %s %s %sh at rate %s - %s...", date, timekeeper, hours_str, rate, description[:50])
                 else:
-                    # Multi-line entry - start collecting
-                    current_entry = {
-                        'pdf_filename': filename,
-                        'date': date,
-                        'timekeeper': timekeeper,
-                        'hours': None,
-                        'description': '',
-                        'rate': rate,
-                        'lawyer_name': lawyer_name,
-                        'title': title,
-                        'amount': 0.0
-                    }
-                    current_description = [rest_of_line]
+                    # Multi-line entry - start collecting; hours and description come later
+                    current_entry = (date, timekeeper, rate, lawyer_name, title)
+                    current_description = [description]
                     in_multi_line_entry = True  # Set flag
-                    print(f"Started multi-line entry: {date} {timekeeper} at rate {rate} - {rest_of_line[:20]}...{rest_of_line[-10:]}")
+                    if debug:
+                        logger.debug("Started multi-line entry: %s %s at rate %s - %s...%s", date, timekeeper, rate, description[:20], description[-10:])
             
             # If we're in the middle of a multi-line entry, add to description
             elif in_multi_line_entry:
-                # Skip date lines in format "dd B yyyy" even in continuation lines
-
                 # Check if this line contains hours (end of entry)
-                hours_match = re.search(r'(\d+[,.]\d+)$', line)
-                if hours_match:
+                if hours_str:
                     # This line contains hours - complete the entry immediately
-                    hours_str = hours_match.group(1)
-                    description_part = line[:hours_match.start()].strip()
+                    description_part = line_match.group('text')
                     
                     if description_part:
                         current_description.append(description_part)
                     
                     full_description = ' '.join(current_description)
-                    current_entry['hours'] = parse_european_hours(hours_str)
-                    current_entry['description'] = full_description
-                    # Calculate amount using the rate we already stored
-                    amount = hours * current_entry['rate']
+                    date, timekeeper, rate, lawyer_name, title = current_entry
                     
-                    current_entry.update({
-                        'hours': current_entry['hours'],
-                        'description': current_entry['description'],
-                        'amount': amount
-                    })                    
-                    fee_detail_data.append(current_entry)
-                    print(f"Completed multi-line entry with hours detected: {current_entry['date']} {current_entry['timekeeper']} {current_entry['hours']}h at rate {current_entry['rate']} = {amount}")
+                    add_row((filename, date, timekeeper, hours_str, full_description,
+                             rate, lawyer_name, title))
+                    if debug:
+                        logger.debug("Completed multi-line entry with hours detected: %s %s %sh at rate %s", date, timekeeper, hours_str, rate)
                     
                     current_entry = None
                     current_description = []
@@ -386,453 +316,103 @@ def extract_quinn_fee_detail(text, filename, fee_summary_data):
                 else:
                     # This is a continuation line without hours
                     current_description.append(line)
-                    print(f"Added continuation: {line[:250]}...")
+                    if debug:
+                        logger.debug("Added continuation: %s...", line[:250])
         
-        # Handle the last entry if we're still collecting
-        if current_entry and current_description:
-            full_description = ' '.join(current_description)
-            hours_match = re.search(r'(\d+[,.]\d+)', full_description)
-            
-            if hours_match:
-                hours_str = hours_match.group(1)
-                description = full_description[:hours_match.start()].strip()
-                current_entry['hours'] = parse_european_hours(hours_str)
-                current_entry['description'] = description
-                # Calculate amount using the rate we already stored
-                amount = hours * current_entry['rate']
-                
-                current_entry.update({
-                    'hours': current_entry['hours'],
-                    'description': current_entry['description'],
-                    'amount': amount
-                })                
-                fee_detail_data.append(current_entry)
-                print(f"Completed final entry: {current_entry['date']} {current_entry['timekeeper']} {current_entry['hours']}h at rate {current_entry['rate']} = {amount}")
-            else:
-                print(f"Warning: Incomplete final entry: {current_entry['date']} {current_entry['timekeeper']}")
+        # An entry still open at the end of the section never had hours
+        if current_entry is not None:
+            logger.warning("Incomplete final entry: %s %s", current_entry[0], current_entry[1])
     
     else:
-        print("Warning: Could not find Fee Detail section")
+        logger.warning("Could not find Fee Detail section")
     
     return fee_detail_data
 
-'''
-def extract_quinn_fee_detail(text, filename):
+# Patent litigation specific task categories, in priority order; the first one with a
+# keyword anywhere in the description wins
+QUINN_TASK_CATEGORIES = {
+    'testing': ['test', 'lab', 'experiment', 'iv test', 'testing', 'zsw', 'csem', 'laboratori'],
+    'claim charting': ['claim', 'infringement analysi', 'chart', 'element mapping'],
+    'complaint drafting': ['draft complaint', 'complaint', 'brief', 'motion', 'plead'],
+    'evidence preparation': ['evidence', 'proof', 'document', 'expert report', 'present evidence'],
+    'client communication': ['client', 'email client', 'call client', 'discuss with client', 'purplevine'],
+    'legal research': ['research', 'legal research', 'case law', 'statutor', 'regulator'],
+    'document review': ['review', 'analyze', 'analysis', 'examin'],
+    'strategy development': ['strateg', 'plan', 'approach', 'next step'],
+    'expert coordination': ['expert', 'witness', 'testifi', 'csem'],
+    'meet and confer': ['confer', 'meet', 'discuss', 'call with'],
+}
+_QUINN_TASK_NAMES = list(QUINN_TASK_CATEGORIES)
+# One alternation per category, matched against a whole column at a time
+_QUINN_TASK_PATTERNS = ['|'.join(re.escape(k) for k in keywords) for keywords in QUINN_TASK_CATEGORIES.values()]
+
+def categorize_task_quinn_column(descriptions):
     """
-    Extract fee detail data from Quinn Emanuel text - Statement Detail section
+    Categorize a Series of descriptions for Quinn Emanuel - patent litigation focused.
+    Runs one vectorized str.contains pass per category (ten in all) over the distinct
+    lowercased descriptions; the first category that matched, in priority order, wins
     """
-    fee_detail_data = []
-    
-    # Find Statement Detail section
-    fee_detail_match = re.search(r'Statement Detail(.*?)(?=Total Hours\s+\d+[,.]\d{2}|Fee Summary|\Z)', text, re.IGNORECASE | re.DOTALL)
-    
-    if not fee_detail_match:
-        # Try alternative pattern
-        fee_detail_match = re.search(r'Date\s+Timekeeper\s+Description\s+Hours(.*?)(?=Total Hours\s+\d+[,.]\d{2}|Fee Summary|\Z)', text, re.IGNORECASE | re.DOTALL)
-    
-    if fee_detail_match:
-        fee_detail_text = fee_detail_match.group(1)
-        print(f"Found Fee Detail section, length: {len(fee_detail_text)}")  # Debug
-        
-        fee_detail_text = re.sub(r'quinn\s+emanuel\s+\|\s+germany$', '', fee_detail_text)
-        #fee_detail_text = re.sub(r'\d{1,2}\s+[A-Za-z]+\s+\d{4}', '', fee_detail_text)
-
-        print(f"Text: {(fee_detail_text)}")
-        lines = fee_detail_text.split('\n')
-        current_entry = None
-        current_description = []
-        
-        for i, line in enumerate(lines):
-            line = re.sub(r'quinn\s+emanuel\s+\|\s+germany', '', line)
-            line = line.strip()
-            
-            if not line or ' | ' in line or 'Invoice No:' in line or 'Matter No:' in line or \
-                'Quinn Emanuel Urquhart' in line or '201996011004, with headquarters located' in line or 'laws of the State of California.' in line or \
-                'employee or consultant with an equivalent status' in line or 'referred to as partners while not belonging to the partnership' in line or \
-                'Date Timekeeper Description Hours' in line:
-                continue
-            print(f">>>{line}")    
-            # Skip header lines
-            if any(header in line.lower() for header in ['date', 'timekeeper', 'description', 'hours']):
-                continue
-            
-            # Check if this line starts with a date pattern (DD/MM/YY)
-            date_match = re.match(r'^(\d{2}/\d{2}/\d{2})\s+([A-Z0-9]{2,})\s+(.*)', line)
-            
-            if date_match:
-                # Save previous entry if exists
-                if current_entry and current_description:
-                    # Join the accumulated description lines and look for hours at the end
-                    full_description = ' '.join(current_description)
-                    print(f"DEBUG: Processing accumulated description: {full_description}")
-                    hours_match = re.search(r'(\d+[,.]\d+)$', full_description)
-                    if not hours_match:
-                        # Try with spaces around the hours
-                        hours_match = re.search(r'\s+(\d+[,.]\d+)$', full_description)
-
-                    if hours_match:
-                        hours_str = hours_match.group(1)
-                        description = full_description[:hours_match.start()].strip()
-                        current_entry['hours'] = parse_european_hours(hours_str)
-                        current_entry['description'] = description
-                        fee_detail_data.append(current_entry)
-                        print(f"Completed multi-line entry: {current_entry['date']} {current_entry['timekeeper']} {current_entry['hours']}h")
-                    else:
-                        hours_match = re.search(r'(\d+[,.]\d+)$', full_description) #try again to catch full line
-                        if hours_match:
-                            hours_str = hours_match.group(1)
-                            description = full_description[:hours_match.start()].strip()
-                            current_entry['hours'] = parse_european_hours(hours_str)
-                            current_entry['description'] = description
-                            fee_detail_data.append(current_entry)
-                            print(f"Last line entry: {current_entry['date']} {current_entry['timekeeper']} {current_entry['hours']}h")
-                        else:
-                            print(f"WARNING: No hours found for entry: {current_entry['date']} {current_entry['timekeeper']} {full_description}")
-
-                
-                # Start new entry
-                date = date_match.group(1)
-                timekeeper = date_match.group(2).strip()
-                rest_of_line = date_match.group(3).strip()
-                
-                # Check if this line already contains hours
-                hours_match = re.search(r'(\d+[,.]\d+)$', rest_of_line)
-                if hours_match:
-                    # Single line entry with hours
-                    hours_str = hours_match.group(1)
-                    description = rest_of_line[:hours_match.start()].strip()
-                    hours = parse_european_hours(hours_str)
-                    
-                    entry = {
-                        'pdf_filename': filename,
-                        'date': date,
-                        'timekeeper': timekeeper,
-                        'hours': hours,
-                        'description': description
-                    }
-                    fee_detail_data.append(entry)
-                    current_entry = None
-                    current_description = []
-                    print(f"Parsed single-line entry: {date} {timekeeper} {hours}h - {description[:50]}...")
-                else:
-                    # Multi-line entry - start collecting
-                    current_entry = {
-                        'pdf_filename': filename,
-                        'date': date,
-                        'timekeeper': timekeeper,
-                        'hours': None,
-                        'description': ''
-                    }
-                    current_description = [rest_of_line]
-                    print(f"Started multi-line entry: {date} {timekeeper} - {rest_of_line[:20]}...{rest_of_line[:-10]}")
-            
-            # If we're in the middle of a multi-line entry, add to description
-            elif current_entry is not None:
-                # Skip date lines in format "dd B yyyy" even in continuation lines
-
-                # Check if this line contains hours (end of entry)
-                #hours_match = re.search(r'(\d+[,.]\d+)$', line)
-                hours_match = re.search(r'(\d+[,.]\d+)', line)
-                if hours_match:
-                    # This line ends with hours - complete the entry
-                    hours_str = hours_match.group(1)
-                    description_part = line[:hours_match.start()].strip()
-                    
-                    if description_part:
-                        current_description.append(description_part)
-                    
-                    full_description = ' '.join(current_description)
-                    current_entry['hours'] = parse_european_hours(hours_str)
-                    current_entry['description'] = full_description
-                    fee_detail_data.append(current_entry)
-                    print(f"Completed multi-line entry: {current_entry['date']} {current_entry['timekeeper']} {current_entry['hours']}h")
-                    
-                    current_entry = None
-                    current_description = []
-                else:
-                    # This is a continuation line without hours
-                    current_description.append(line)
-                    print(f"Added continuation: {line[:250]}...")
-        
-        # Handle the last entry if we're still collecting
-        if current_entry and current_description:
-            full_description = ' '.join(current_description)
-            #hours_match = re.search(r'(\d+[,.]\d+)$', full_description)
-            hours_match = re.search(r'(\d+[,.]\d+)', full_description)
-            
-            if hours_match:
-                hours_str = hours_match.group(1)
-                description = full_description[:hours_match.start()].strip()
-                current_entry['hours'] = parse_european_hours(hours_str)
-                current_entry['description'] = description
-                fee_detail_data.append(current_entry)
-                print(f"Completed final entry: {current_entry['date']} {current_entry['timekeeper']} {current_entry['hours']}h")
-            else:
-                print(f"Warning: Incomplete final entry: {current_entry['date']} {current_entry['timekeeper']}")
-    
-    else:
-        print("Warning: Could not find Fee Detail section")
-    
-    return fee_detail_data
-'''
-def parse_european_hours(hours_str):
-    """Parse European number format with comma as decimal separator"""
-    try:
-        # Replace comma with dot for float conversion
-        return float(hours_str.replace(',', '.'))
-    except ValueError:
-        print(f"Warning: Could not parse hours value: {hours_str}")
-        return 0.0
-
-'''
-def extract_quinn_fee_detail(text, filename):
-    """
-    Extract fee detail data from Quinn Emanuel text - Statement Detail section
-    """
-    fee_detail_data = []
-    
-    # Find Statement Detail section
-    fee_detail_match = re.search(r'Statement Detail(.*?)(?=Total Hours\s+\d+[,.]\d{2}|Fee Summary|\Z)', text, re.IGNORECASE | re.DOTALL)
-    
-    if not fee_detail_match:
-        # Try alternative pattern
-        fee_detail_match = re.search(r'Date\s+Timekeeper\s+Description\s+Hours(.*?)(?=Total Hours\s+\d+[,.]\d{2}|Fee Summary|\Z)', text, re.IGNORECASE | re.DOTALL)
-    
-    if fee_detail_match:
-        fee_detail_text = fee_detail_match.group(1)
-        print(f"Found Fee Detail section, length: {len(fee_detail_text)}")  # Debug
-        
-        # Improved pattern to handle multi-line descriptions
-        lines = fee_detail_text.split('\n')
-        current_entry = None
-        collecting_description = False
-        
-        for i, line in enumerate(lines):
-            line = line.strip()
-            if not line:
-                continue
-                
-            # Skip header lines
-            if any(header in line.lower() for header in ['date', 'timekeeper', 'description', 'hours']):
-                continue
-            
-            # Check if this line starts with a date pattern (DD/MM/YY)
-            date_match = re.match(r'^(\d{2}/\d{2}/\d{2})\s+([A-Z]{2})\s+(.*)', line)
-            
-            if date_match:
-                # Save previous entry if exists
-                if current_entry:
-                    fee_detail_data.append(current_entry)
-                
-                # Start new entry
-                date = date_match.group(1)
-                timekeeper = date_match.group(2).strip()
-                description_start = date_match.group(3).strip()
-                
-                # Check if this line already contains hours at the end
-                hours_match = re.search(r'(\d+[,.]\d+)$', description_start)
-                if hours_match:
-                    # Extract hours from description
-                    hours_str = hours_match.group(1)
-                    description = description_start[:hours_match.start()].strip()
-                    hours = parse_european_hours(hours_str)
-                    
-                    current_entry = {
-                        'pdf_filename': filename,
-                        'date': date,
-                        'timekeeper': timekeeper,
-                        'hours': hours,
-                        'description': description
-                    }
-                    print(f"Parsed fee detail with hours: {date} {timekeeper} {hours}h - {description[:50]}...")
-                    current_entry = None  # Reset since we have complete entry
-                else:
-                    # Start collecting multi-line description
-                    current_entry = {
-                        'pdf_filename': filename,
-                        'date': date,
-                        'timekeeper': timekeeper,
-                        'hours': None,
-                        'description': description_start
-                    }
-                    collecting_description = True
-                    print(f"Started fee detail: {date} {timekeeper} - {description_start[:50]}...")
-            
-            # Check if we're collecting description and this line contains hours
-            elif collecting_description and current_entry:
-                hours_match = re.search(r'(\d+[,.]\d+)$', line)
-                if hours_match:
-                    # Found hours at the end of the line
-                    hours_str = hours_match.group(1)
-                    description_continuation = line[:hours_match.start()].strip()
-                    
-                    # Append the final part of description
-                    if description_continuation:
-                        current_entry['description'] += ' ' + description_continuation
-                    
-                    current_entry['hours'] = parse_european_hours(hours_str)
-                    fee_detail_data.append(current_entry)
-                    print(f"Completed fee detail: {current_entry['date']} {current_entry['timekeeper']} {current_entry['hours']}h")
-                    current_entry = None
-                    collecting_description = False
-                else:
-                    # This is a continuation line of description
-                    current_entry['description'] += ' ' + line
-                    print(f"Added continuation to description: {line[:50]}...")
-        
-        # Don't forget the last entry if we're still collecting
-        if current_entry and current_entry['hours'] is not None:
-            fee_detail_data.append(current_entry)
-        elif current_entry:
-            print(f"Warning: Incomplete entry at end: {current_entry['date']} {current_entry['timekeeper']}")
-    
-    else:
-        print("Warning: Could not find Fee Detail section")
-    
-    return fee_detail_data
-
-
-
-
-def extract_quinn_fee_detail(text, filename):
+    # Invoices repeat the same phrasings, so each distinct description is checked once
+    codes, uniques = pd.factorize(descriptions.str.lower())
+    uniques = pd.Series(uniques)
+    matches = [uniques.str.contains(pattern, regex=True, na=False).to_numpy(dtype=bool)
+               for pattern in _QUINN_TASK_PATTERNS]
+    # Missing descriptions get code -1; appending "Other" makes that index pick it
+    categories = np.append(np.select(matches, _QUINN_TASK_NAMES, default="Other").astype(object), "Other")
+    return pd.Series(categories[codes], index=descriptions.index, dtype=str)
+
+def _read_quinn_text_pdfium(pdf_path):
     """
-    Extract fee detail data from Quinn Emanuel text - Statement Detail section
+    Read the text of all pages with pdfium, one page per line block
     """
-    fee_detail_data = []
-    
-    # Find Statement Detail section
-    fee_detail_match = re.search(r'Statement Detail(.*?)(?=Total Hours\s+\d+[,.]\d{2}|Fee Summary|\Z)', text, re.IGNORECASE | re.DOTALL)
-    
-    if not fee_detail_match:
-        # Try alternative pattern
-        fee_detail_match = re.search(r'Date\s+Timekeeper\s+Description\s+Hours(.*?)(?=Total Hours\s+\d+[,.]\d{2}|Fee Summary|\Z)', text, re.IGNORECASE | re.DOTALL)
-    
-    if fee_detail_match:
-        fee_detail_text = fee_detail_match.group(1)
-        print(f"Found Fee Detail section, length: {len(fee_detail_text)}")  # Debug
-        
-        # Quinn Emanuel pattern: "01/09/25 JB6 Follow-up with team... 0,50"
-        # More flexible patterns to handle variations
-        patterns = [
-            r'^(\d{2}/\d{2}/\d{2})\s+([A-Z0-9]+)\s+(.*?)\s+(\d+[,.]\d+)$',
-            r'^(\d{1,2}/\d{1,2}/\d{2,4})\s+([A-Z0-9]+)\s+(.*?)\s+(\d+[,.]\d+)$',
-        ]
-        
-        lines = fee_detail_text.split('\n')
-        current_entry = None
-        
-        for i, line in enumerate(lines):
-            line = line.strip()
-            if not line:
-                continue
-                
-            # Skip header lines
-            if any(header in line.lower() for header in ['date', 'timekeeper', 'description', 'hours']):
-                continue
-                
-            # Check if this line starts with a date (DD/MM/YY or similar)
-            parsed = False
-            for pattern in patterns:
-                match = re.match(pattern, line)
-                if match:
-                    # Save previous entry if exists
-                    if current_entry:
-                        fee_detail_data.append(current_entry)
-                    
-                    # Start new entry
-                    date = match.group(1)
-                    timekeeper = match.group(2).strip()
-                    description = match.group(3).strip()
-                    hours_str = match.group(4)
-                    
-                    hours = parse_european_hours(hours_str)
-                    
-                    current_entry = {
-                        'pdf_filename': filename,
-                        'date': date,
-                        'timekeeper': timekeeper,
-                        'hours': hours,
-                        'description': description
-                    }
-                    print(f"Parsed fee detail: {date} {timekeeper} {hours}h - {description[:50]}...")  # Debug
-                    parsed = True
-                    break
-            
-            if not parsed:
-                # This might be a continuation line, append to current description
-                if current_entry and line and not re.match(r'^\d+[,.]\d+$', line.strip()):
-                    current_entry['description'] += ' ' + line.strip()
-                    print(f"Added continuation to description: {line[:50]}...")  # Debug
-                else:
-                    print(f"Warning: Could not parse fee detail line {i}: '{line}'")
-        
-        # Don't forget the last entry
-        if current_entry:
-            fee_detail_data.append(current_entry)
-    
-    else:
-        print("Warning: Could not find Fee Detail section")
-    
-    return fee_detail_data
-    '''
-def categorize_task_quinn(description):
+    pdf = pdfium.PdfDocument(str(pdf_path))
+    try:
+        pages_text = []
+        for page in pdf:
+            textpage = page.get_textpage()
+            # pdfium ends lines with CRLF; the extract_quinn_* patterns expect plain newlines
+            pages_text.append(textpage.get_text_range().replace('\r\n', '\n'))
+            # Release each page as soon as its text is out
+            textpage.close()
+            page.close()
+    finally:
+        pdf.close()
+    return '\n'.join(pages_text)
+
+def read_quinn_pdf_text(pdf_path):
     """
-    Categorize task based on description for Quinn Emanuel - patent litigation focused
+    Read the text of all pages, using pdfium when available and pypdf/PyPDF2 otherwise
     """
-    if not description:
-        return "Other"
-    
-    try:
-        description_lower = description.lower()
-        
-        # Patent litigation specific task categories
-        if any(word in description_lower for word in ['test', 'lab', 'experiment', 'iv test', 'testing', 'zsw', 'csem', 'laboratori']):
-            return "testing"
-        elif any(word in description_lower for word in ['claim', 'infringement analysi', 'chart', 'element mapping']):
-            return "claim charting"
-        elif any(word in description_lower for word in ['draft complaint', 'complaint', 'brief', 'motion', 'plead']):
-            return "complaint drafting"
-        elif any(word in description_lower for word in ['evidence', 'proof', 'document', 'expert report', 'present evidence']):
-            return "evidence preparation"
-        elif any(word in description_lower for word in ['client', 'email client', 'call client', 'discuss with client', 'purplevine']):
-            return "client communication"
-        elif any(word in description_lower for word in ['research', 'legal research', 'case law', 'statutor', 'regulator']):
-            return "legal research"
-        elif any(word in description_lower for word in ['review', 'analyze', 'analysis', 'examin']):
-            return "document review"
-        elif any(word in description_lower for word in ['strateg', 'plan', 'approach', 'next step']):
-            return "strategy development"
-        elif any(word in description_lower for word in ['expert', 'witness', 'testifi', 'csem']):
-            return "expert coordination"
-        elif any(word in description_lower for word in ['confer', 'meet', 'discuss', 'call with']):
-            return "meet and confer"
+    if pdfium is not None:
+        try:
+            return _read_quinn_text_pdfium(pdf_path)
+        except pdfium.PdfiumError as e:
+            logger.warning("pdfium could not read %s (%s); falling back to PyPDF2", pdf_path, e)
+    
+    with open(pdf_path, 'rb') as file:
+        if pypdf is not None:
+            # Plain extraction mode; layout mode reflows the lines the patterns rely on
+            pdf_reader = pypdf.PdfReader(file, strict=False)
         else:
-            return "Other"
-    except Exception as e:
-        print(f"Error in task categorization: {e}")
-        return "Other"
+            pdf_reader = PyPDF2.PdfReader(file, strict=False)
+        return ''.join(page.extract_text() or '' for page in pdf_reader.pages)
 
 def extract_quinn_invoice_data(pdf_path):
     """
     Extract invoice data from Quinn Emanuel PDF file
     """
     try:
-        with open(pdf_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            text = ""
-            for page in pdf_reader.pages:
-                text += page.extract_text()
-        
+        text = read_quinn_pdf_text(pdf_path)
         return extract_quinn_data_from_text(text, pdf_path.name)
     except Exception as e:
-        print(f"Error reading PDF {pdf_path}: {e}")
+        logger.error("Error reading PDF %s: %s", pdf_path, e)
         return None, None
 
 def extract_quinn_data_from_text(text, filename):
     """
     Extract fee summary and fee detail data from Quinn Emanuel invoice text
     """
-    print(f"\nProcessing file: {filename}")  # Debug
+    logger.debug("Processing file: %s", filename)
     
     # Extract header information
     invoice_date = extract_quinn_invoice_date(text)
@@ -840,7 +420,7 @@ def extract_quinn_data_from_text(text, filename):
     matter_no = extract_quinn_matter_no(text)
     client_matter = extract_quinn_client_matter(text)
     
-    print(f"Extracted - Date: {invoice_date}, Invoice: {invoice_no}, Matter: {matter_no}")  # Debug
+    logger.debug("Extracted - Date: %s, Invoice: %s, Matter: %s", invoice_date, invoice_no, matter_no)
     
     # Extract fee summary data
     fee_summary_data = extract_quinn_fee_summary(text, filename, invoice_date, invoice_no, matter_no, client_matter)
@@ -848,180 +428,199 @@ def extract_quinn_data_from_text(text, filename):
     # Extract fee detail data
     fee_detail_data = extract_quinn_fee_detail(text, filename, fee_summary_data)
     
-    # Categorize tasks in fee detail
-    for entry in fee_detail_data:
-        entry['task_category'] = categorize_task_quinn(entry['description'])
-    
     return fee_summary_data, fee_detail_data
 
-def process_quinn_pdf_directory(directory_path):
+def parse_european_hours_column(hours):
+    """Parse a Series of European hours strings in one pass; unparsable values become 0.0"""
+    parsed = pd.to_numeric(hours.str.translate(_EUROPEAN_HOURS_TABLE), errors='coerce')
+    for hours_str in hours[parsed.isna()]:
+        logger.warning("Could not parse hours value: %s", hours_str)
+    return parsed.fillna(0.0)
+
+def iter_quinn_invoices(pdf_files, workers=None):
+    """
+    Yield (fee_summary, fee_detail) rows for each PDF file, in file order, as each is extracted.
+    workers is the number of worker processes (default: CPU count); 1 processes in-line
+    """
+    # PDF parsing and the regex pipeline are CPU-bound and independent per file
+    return iter_in_order(extract_quinn_invoice_data, pdf_files, workers=workers,
+                         log_level=logger.getEffectiveLevel())
+
+def build_quinn_dataframes(fee_summary_rows, fee_detail_rows):
+    """
+    Build the fee summary and fee detail dataframes from extracted row tuples
+    """
+    fee_summary_df = pd.DataFrame(fee_summary_rows, columns=QUINN_FEE_SUMMARY_COLUMNS) if fee_summary_rows else pd.DataFrame()
+    fee_detail_df = pd.DataFrame(fee_detail_rows, columns=QUINN_FEE_DETAIL_COLUMNS) if fee_detail_rows else pd.DataFrame()
+    
+    # Convert all fee detail hours at once, then price them at the timekeeper's rate
+    if not fee_detail_df.empty:
+        fee_detail_df['hours'] = parse_european_hours_column(fee_detail_df['hours'])
+        fee_detail_df.insert(fee_detail_df.columns.get_loc('title') + 1, 'amount',
+                             fee_detail_df['hours'] * fee_detail_df['rate'])
+        # Categorize every description in one pass over the column
+        fee_detail_df['task_category'] = categorize_task_quinn_column(fee_detail_df['description'])
+    
+    return fee_summary_df, fee_detail_df
+
+def process_quinn_pdf_directory(directory_path, workers=None, cache_dir=None):
     """
-    Process all Quinn Emanuel PDF files in the directory and return dataframes
+    Process all Quinn Emanuel PDF files in the directory and return dataframes.
+    workers is the number of worker processes (default: CPU count); 1 processes in-line.
+    With cache_dir, results are stored as Parquet and reused while the PDF files are unchanged
     """
-    all_fee_summary = []
-    all_fee_detail = []
+    pdf_files = find_pdf_files(directory_path)
     
-    pdf_files = list(Path(directory_path).glob('*.pdf'))
+    logger.info("Found %d PDF files to process...", len(pdf_files))
     
-    print(f"Found {len(pdf_files)} PDF files to process...")
+    return cached_frames(cache_dir, pdf_files, lambda: _extract_quinn_pdf_files(pdf_files, workers),
+                         prefix='quinn_')
+
+def _extract_quinn_pdf_files(pdf_files, workers):
+    """
+    Extract and combine the fee summary and fee detail dataframes of Quinn Emanuel pdf_files
+    """
+    # One frame per invoice, built as soon as it is extracted so its row tuples can be freed
+    fee_summary_frames = []
+    fee_detail_frames = []
     
-    for pdf_file in pdf_files:
-        print(f"\nProcessing: {pdf_file.name}")
-        fee_summary, fee_detail = extract_quinn_invoice_data(pdf_file)
+    for pdf_file, (fee_summary, fee_detail) in zip(pdf_files, iter_quinn_invoices(pdf_files, workers=workers)):
+        logger.info("Processing: %s", pdf_file.name)
         
         if fee_summary:
-            all_fee_summary.extend(fee_summary)
-            print(f"Found {len(fee_summary)} fee summary entries")
+            logger.info("Found %d fee summary entries", len(fee_summary))
         
         if fee_detail:
-            all_fee_detail.extend(fee_detail)
-            print(f"Found {len(fee_detail)} fee detail entries")
+            logger.info("Found %d fee detail entries", len(fee_detail))
+        
+        fee_summary_df, fee_detail_df = build_quinn_dataframes(fee_summary or [], fee_detail or [])
+        if not fee_summary_df.empty:
+            fee_summary_frames.append(fee_summary_df)
+        if not fee_detail_df.empty:
+            fee_detail_frames.append(fee_detail_df)
     
     # Create dataframes
-    fee_summary_df = pd.DataFrame(all_fee_summary) if all_fee_summary else pd.DataFrame()
-    fee_detail_df = pd.DataFrame(all_fee_detail) if all_fee_detail else pd.DataFrame()
-    
+    fee_summary_df = pd.concat(fee_summary_frames, ignore_index=True) if fee_summary_frames else pd.DataFrame()
+    fee_detail_df = pd.concat(fee_detail_frames, ignore_index=True) if fee_detail_frames else pd.DataFrame()
     return fee_summary_df, fee_detail_df
 
-def create_monthly_timekeeper_pivot(fee_summary_df, fee_detail_df):
+def write_quinn_parquet(directory_path, output_dir, workers=None):
     """
-    Create monthly pivot tables for timekeeper hours and amounts
-    Returns two dataframes: monthly_hours_pivot, monthly_amount_pivot
+    Process all Quinn Emanuel PDF files in the directory, appending each invoice's rows to
+    fee_summary.parquet and fee_detail.parquet in output_dir as soon as it is extracted,
+    so memory stays bounded by one invoice however many files there are
     """
-    if fee_summary_df.empty or fee_detail_df.empty:
-        return pd.DataFrame(), pd.DataFrame()
+    if pq is None:
+        raise ImportError("write_quinn_parquet needs pyarrow")
     
-    # Create a combined dataframe for analysis
-    combined_data = []
+    pdf_files = find_pdf_files(directory_path)
     
-    for _, fee_detail_row in fee_detail_df.iterrows():
-        # Find matching fee summary entry to get rate and full name
-        matching_summary = fee_summary_df[
-            (fee_summary_df['pdf_filename'] == fee_detail_row['pdf_filename']) & 
-            (fee_summary_df['initials'] == fee_detail_row['timekeeper'])
-        ]
-        
-        if not matching_summary.empty:
-            rate = matching_summary.iloc[0]['rate']
-            lawyer_name = matching_summary.iloc[0]['lawyer_name']
-            title = matching_summary.iloc[0]['title']
-            matter_no = matching_summary.iloc[0]['matter_no']
-            invoice_date = matching_summary.iloc[0]['date_of_invoice']
-            
-            # Parse the work date (DD/MM/YY format)
-            try:
-                work_date = datetime.strptime(fee_detail_row['date'], '%d/%m/%y')
-                year_month = work_date.strftime('%Y-%m')
-                month_name = work_date.strftime('%B %Y')
-            except:
-                year_month = "Unknown"
-                month_name = "Unknown"
-            
-            amount = fee_detail_row['hours'] * rate
+    logger.info("Found %d PDF files to process...", len(pdf_files))
+    
+    os.makedirs(output_dir, exist_ok=True)
+    # One writer per output file, opened with the schema of the first invoice that has rows
+    writers = {}
+    try:
+        for pdf_file, (fee_summary, fee_detail) in zip(pdf_files, iter_quinn_invoices(pdf_files, workers=workers)):
+            logger.info("Processing: %s", pdf_file.name)
             
-            combined_data.append({
-                'pdf_filename': fee_detail_row['pdf_filename'],
-                'matter_no': matter_no,
-                'invoice_date': invoice_date,
-                'work_date': fee_detail_row['date'],
-                'year_month': year_month,
-                'month_name': month_name,
-                'timekeeper': fee_detail_row['timekeeper'],
-                'lawyer_name': lawyer_name,
-                'title': title,
-                'hours': fee_detail_row['hours'],
-                'rate': rate,
-                'amount': amount,
-                'description': fee_detail_row['description'],
-                'task_category': fee_detail_row['task_category']
-            })
+            frames = build_quinn_dataframes(fee_summary or [], fee_detail or [])
+            for name, df in zip(('fee_summary', 'fee_detail'), frames):
+                if df.empty:
+                    continue
+                table = pa.Table.from_pandas(df, preserve_index=False)
+                writer = writers.get(name)
+                if writer is None:
+                    writer = writers[name] = pq.ParquetWriter(os.path.join(output_dir, name + '.parquet'), table.schema)
+                writer.write_table(table.cast(writer.schema))
+                logger.info("Wrote %d %s entries", len(df), name.replace('_', ' '))
+    finally:
+        for writer in writers.values():
+            writer.close()
+
+_SUMMARY_CATEGORY_COLUMNS = ['pdf_filename', 'timekeeper', 'lawyer_name', 'title', 'task_category',
+                             'year_month', 'month_name']
+
+def _build_enriched(fee_summary_df, fee_detail_df):
+    """
+    Join fee detail entries to the fee summary row for their invoice and timekeeper,
+    adding matter_no, invoice_date, year_month, month_name and a summary-rate amount.
+    Entries without a matching fee summary row are dropped
+    """
+    if fee_summary_df.empty or fee_detail_df.empty:
+        return pd.DataFrame()
     
-    if not combined_data:
+    summary = fee_summary_df[['pdf_filename', 'initials', 'rate', 'lawyer_name', 'title',
+                              'matter_no', 'date_of_invoice']]
+    # Only the first fee summary row for an invoice/timekeeper pair is used
+    summary = summary.drop_duplicates(['pdf_filename', 'initials'])
+    detail = fee_detail_df[['pdf_filename', 'date', 'timekeeper', 'hours', 'description', 'task_category']]
+    merged = detail.merge(summary, left_on=['pdf_filename', 'timekeeper'],
+                          right_on=['pdf_filename', 'initials'], how='inner')
+    
+    # Work dates are DD/MM/YY; anything unparseable is reported as "Unknown"
+    work_date = pd.to_datetime(merged['date'], format='%d/%m/%y', errors='coerce')
+    merged['year_month'] = work_date.dt.strftime('%Y-%m').fillna('Unknown')
+    merged['month_name'] = work_date.dt.strftime('%B %Y').fillna('Unknown')
+    merged['amount'] = merged['hours'] * merged['rate']
+    # Few distinct values each, so pivots and groupbys work on integer codes instead of strings
+    for col in _SUMMARY_CATEGORY_COLUMNS:
+        merged[col] = merged[col].astype('category')
+    return merged.rename(columns={'date': 'work_date', 'date_of_invoice': 'invoice_date'})
+
+def create_monthly_timekeeper_pivot(combined_df):
+    """
+    Create monthly pivot tables for timekeeper hours and amounts from the output of _build_enriched
+    Returns two dataframes: monthly_hours_pivot, monthly_amount_pivot
+    """
+    if combined_df.empty:
         return pd.DataFrame(), pd.DataFrame()
     
-    combined_df = pd.DataFrame(combined_data)
-    
-    # Create monthly hours pivot
-    monthly_hours_pivot = combined_df.pivot_table(
-        index=['year_month', 'month_name'],
-        columns='lawyer_name',
-        values='hours',
-        aggfunc='sum',
-        fill_value=0
-    ).round(2)
+    # One groupby sums hours and amounts together; pivot_table would group once per value.
+    # observed=True keeps it to the month/lawyer pairs that actually occur
+    monthly_sums = combined_df.groupby(
+        ['year_month', 'month_name', 'lawyer_name'], observed=True
+    )[['hours', 'amount']].sum()
     
-    # Add total row and column
-    monthly_hours_pivot['Total Hours'] = monthly_hours_pivot.sum(axis=1)
-    monthly_hours_pivot.loc['Total'] = monthly_hours_pivot.sum()
-    
-    # Create monthly amount pivot
-    monthly_amount_pivot = combined_df.pivot_table(
-        index=['year_month', 'month_name'],
-        columns='lawyer_name',
-        values='amount',
-        aggfunc='sum',
-        fill_value=0
-    ).round(2)
+    def _monthly_pivot(values, total_column):
+        pivot = monthly_sums[values].unstack('lawyer_name', fill_value=0).round(2)
+        # Plain string columns, so the total column can be added next to the lawyers
+        pivot.columns = pivot.columns.astype(str)
+        
+        # Add total row and column
+        pivot[total_column] = pivot.sum(axis=1)
+        pivot.loc['Total'] = pivot.sum()
+        return pivot
     
-    # Add total row and column
-    monthly_amount_pivot['Total Amount'] = monthly_amount_pivot.sum(axis=1)
-    monthly_amount_pivot.loc['Total'] = monthly_amount_pivot.sum()
+    # Create monthly hours and amount pivots
+    monthly_hours_pivot = _monthly_pivot('hours', 'Total Hours')
+    monthly_amount_pivot = _monthly_pivot('amount', 'Total Amount')
     
     return monthly_hours_pivot, monthly_amount_pivot
 
-def create_detailed_monthly_summary(fee_summary_df, fee_detail_df):
+def create_detailed_monthly_summary(merged):
     """
-    Create a detailed monthly summary with timekeeper breakdown
+    Create a detailed monthly summary with timekeeper breakdown from the output of _build_enriched
     """
-    if fee_summary_df.empty or fee_detail_df.empty:
+    if merged.empty:
         return pd.DataFrame()
     
-    detailed_data = []
-    
-    for _, fee_detail_row in fee_detail_df.iterrows():
-        # Find matching fee summary entry
-        matching_summary = fee_summary_df[
-            (fee_summary_df['pdf_filename'] == fee_detail_row['pdf_filename']) & 
-            (fee_summary_df['initials'] == fee_detail_row['timekeeper'])
-        ]
-        
-        if not matching_summary.empty:
-            rate = matching_summary.iloc[0]['rate']
-            lawyer_name = matching_summary.iloc[0]['lawyer_name']
-            title = matching_summary.iloc[0]['title']
-            matter_no = matching_summary.iloc[0]['matter_no']
-            
-            # Parse work date
-            try:
-                work_date = datetime.strptime(fee_detail_row['date'], '%d/%m/%y')
-                year_month = work_date.strftime('%Y-%m')
-                month_name = work_date.strftime('%B %Y')
-            except:
-                year_month = "Unknown"
-                month_name = "Unknown"
-            
-            amount = fee_detail_row['hours'] * rate
-            
-            detailed_data.append({
-                'Month': month_name,
-                'Year-Month': year_month,
-                'Matter No': matter_no,
-                'Timekeeper': lawyer_name,
-                'Title': title,
-                'Hours': fee_detail_row['hours'],
-                'Rate': rate,
-                'Amount': amount,
-                'Task Category': fee_detail_row['task_category'],
-                'Description': fee_detail_row['description'][:100] + '...' if len(fee_detail_row['description']) > 100 else fee_detail_row['description']
-            })
-    
-    if not detailed_data:
-        return pd.DataFrame()
-    
-    detailed_df = pd.DataFrame(detailed_data)
+    description = merged['description']
+    detailed_df = pd.DataFrame({
+        'Month': merged['month_name'],
+        'Year-Month': merged['year_month'],
+        'Matter No': merged['matter_no'],
+        'Timekeeper': merged['lawyer_name'],
+        'Title': merged['title'],
+        'Hours': merged['hours'],
+        'Rate': merged['rate'],
+        'Amount': merged['amount'],
+        'Task Category': merged['task_category'],
+        'Description': description.where(description.str.len() <= 100, description.str[:100] + '...')
+    })
     
     # Create summary by month and timekeeper
-    summary_df = detailed_df.groupby(['Year-Month', 'Month', 'Timekeeper', 'Title']).agg({
+    summary_df = detailed_df.groupby(['Year-Month', 'Month', 'Timekeeper', 'Title'], observed=True).agg({
         'Hours': 'sum',
         'Amount': 'sum'
     }).reset_index()
@@ -1041,46 +640,75 @@ def main_quinn():
     # Output Excel file
     output_excel = "quinn_emanuel_invoice_analysis.xlsx"
     
+    parser = argparse.ArgumentParser(description="Extract fee summary and fee detail data from Quinn Emanuel invoice PDFs")
+    parser.add_argument('--directory', default=pdf_directory,
+                        help="directory containing the invoice PDF files")
+    parser.add_argument('--workers', type=positive_int, default=os.cpu_count(),
+                        help="number of worker processes for PDF extraction (1 runs sequentially)")
+    parser.add_argument('--output', default=output_excel,
+                        help="path of the Excel file to write")
+    parser.add_argument('--cache-dir', default=None,
+                        help="reuse extracted data cached here as Parquet while the PDF files are unchanged")
+    parser.add_argument('--parquet-dir', default=None,
+                        help="stream fee_summary.parquet and fee_detail.parquet into this directory, one "
+                             "invoice at a time, instead of building the Excel report in memory")
+    args = parser.parse_args()
+    
+    # Progress and diagnostics go through logging; the report below is printed as before
+    logging.basicConfig(level=logging.INFO, format='%(message)s', stream=sys.stdout)
+    
     try:
+        if args.parquet_dir is not None:
+            # Bounded memory: the monthly summaries need the whole corpus, so they are skipped
+            write_quinn_parquet(args.directory, args.parquet_dir, workers=args.workers)
+            print(f"\nQuinn Emanuel Processing complete!")
+            print(f"Output saved to: {args.parquet_dir}")
+            return
+        
         # Process all Quinn Emanuel PDF files
-        fee_summary_df, fee_detail_df = process_quinn_pdf_directory(pdf_directory)
+        fee_summary_df, fee_detail_df = process_quinn_pdf_directory(args.directory, workers=args.workers,
+                                                                    cache_dir=args.cache_dir)
+        
+        # Join fee detail to fee summary once; both summaries below work from it
+        enriched_df = _build_enriched(fee_summary_df, fee_detail_df)
         
         # Create monthly pivot tables
-        monthly_hours_pivot, monthly_amount_pivot = create_monthly_timekeeper_pivot(fee_summary_df, fee_detail_df)
+        monthly_hours_pivot, monthly_amount_pivot = create_monthly_timekeeper_pivot(enriched_df)
         
         # Create detailed monthly summary
-        detailed_monthly_summary = create_detailed_monthly_summary(fee_summary_df, fee_detail_df)
+        detailed_monthly_summary = create_detailed_monthly_summary(enriched_df)
         
         # Save to Excel
-        with pd.ExcelWriter(output_excel, engine='openpyxl') as writer:
+        # Every sheet is written row by row, so finished rows can be flushed to disk
+        with pd.ExcelWriter(args.output, engine=EXCEL_ENGINE, engine_kwargs=streaming_engine_kwargs()) as writer:
             if not fee_summary_df.empty:
-                fee_summary_df.to_excel(writer, sheet_name='Fee Summary', index=False)
-                print(f"\nSaved {len(fee_summary_df)} fee summary entries")
+                write_sheet(writer, fee_summary_df, 'Fee Summary')
+                logger.info("Saved %d fee summary entries", len(fee_summary_df))
                 
                 # Display sample of extracted data
                 print("\nSample Fee Summary Data:")
                 print(fee_summary_df[['lawyer_name', 'hours', 'rate', 'amount']].head())
             
             if not fee_detail_df.empty:
-                fee_detail_df.to_excel(writer, sheet_name='Fee Detail', index=False)
-                print(f"Saved {len(fee_detail_df)} fee detail entries")
+                write_sheet(writer, fee_detail_df, 'Fee Detail')
+                logger.info("Saved %d fee detail entries", len(fee_detail_df))
             
             # Save monthly pivot tables
             if not monthly_hours_pivot.empty:
-                monthly_hours_pivot.to_excel(writer, sheet_name='Monthly Hours Pivot')
-                print(f"Saved Monthly Hours Pivot table")
+                write_sheet(writer, monthly_hours_pivot, 'Monthly Hours Pivot', index=True)
+                logger.info("Saved Monthly Hours Pivot table")
             
             if not monthly_amount_pivot.empty:
-                monthly_amount_pivot.to_excel(writer, sheet_name='Monthly Amount Pivot')
-                print(f"Saved Monthly Amount Pivot table")
+                write_sheet(writer, monthly_amount_pivot, 'Monthly Amount Pivot', index=True)
+                logger.info("Saved Monthly Amount Pivot table")
             
             # Save detailed monthly summary
             if not detailed_monthly_summary.empty:
-                detailed_monthly_summary.to_excel(writer, sheet_name='Detailed Monthly Summary', index=False)
-                print(f"Saved Detailed Monthly Summary with {len(detailed_monthly_summary)} entries")
+                write_sheet(writer, detailed_monthly_summary, 'Detailed Monthly Summary')
+                logger.info("Saved Detailed Monthly Summary with %d entries", len(detailed_monthly_summary))
         
         print(f"\nQuinn Emanuel Processing complete!")
-        print(f"Output saved to: {output_excel}")
+        print(f"Output saved to: {args.output}")
         
         # Print summary statistics
         if not monthly_hours_pivot.empty:
@@ -1092,9 +720,7 @@ def main_quinn():
             print(monthly_amount_pivot[['Total Amount']])
         
     except Exception as e:
-        print(f"Error in Quinn Emanuel main process: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error in Quinn Emanuel main process: %s", e)
 
 if __name__ == "__main__":
     main_quinn()
\ No newline at end of file
@@ -0,0 +1,119 @@
+import os
+import argparse
+import hashlib
+import logging
+import logging.handlers
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+def init_worker_logging(log_queue, level):
+    """
+    Send a worker process's log records to the parent through log_queue
+    """
+    root = logging.getLogger()
+    # Replace any handlers inherited through fork so records are not emitted twice
+    root.handlers[:] = [logging.handlers.QueueHandler(log_queue)]
+    root.setLevel(level)
+
+def iter_in_order(func, items, workers=None, log_level=logging.INFO):
+    """
+    Yield func(item) for each item, in item order, as each result becomes available.
+    workers is the number of worker processes (default: CPU count); 1 processes in-line.
+    log_level is the level worker processes log at
+    """
+    max_workers = min(workers or os.cpu_count() or 1, len(items))
+    if max_workers <= 1:
+        # Nothing to overlap with a single worker, so skip the process pool
+        for item in items:
+            yield func(item)
+        return
+
+    # PDF parsing is CPU-bound and independent per file, so fan it out to worker processes
+    # Keep at most two items per worker in flight, so finished results never pile up
+    # far ahead of the one being consumed
+    max_pending = 2 * max_workers
+    remaining = iter(items)
+    pending = deque()
+    # Workers queue their log records; the parent emits them through its own handlers
+    log_queue = multiprocessing.Queue()
+    listener = logging.handlers.QueueListener(
+        log_queue, *(logging.getLogger().handlers or [logging.lastResort]), respect_handler_level=True
+    )
+    listener.start()
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=init_worker_logging,
+                                 initargs=(log_queue, log_level)) as executor:
+            for item in remaining:
+                pending.append(executor.submit(func, item))
+                if len(pending) == max_pending:
+                    break
+
+            # Hand results over in item order, submitting the next item as each slot frees up
+            while pending:
+                result = pending.popleft().result()
+                next_item = next(remaining, None)
+                if next_item is not None:
+                    pending.append(executor.submit(func, next_item))
+                yield result
+    finally:
+        listener.stop()
+
+def find_pdf_files(directory_path):
+    """
+    PDF files directly in directory_path, matching the .pdf extension in any case
+    """
+    # DirEntry caches what scandir already read, so is_file() costs no extra stat call
+    return [
+        Path(entry.path) for entry in os.scandir(directory_path)
+        if entry.name.lower().endswith('.pdf') and entry.is_file()
+    ]
+
+def cache_paths(cache_dir, pdf_files, prefix=''):
+    """
+    Parquet paths for the cached fee summary and fee detail of this exact set of PDF files
+    """
+    # Any added, removed, replaced or touched PDF changes the key
+    file_stats = sorted((str(p.resolve()), p.stat().st_mtime_ns, p.stat().st_size) for p in pdf_files)
+    cache_key = hashlib.sha256(repr(file_stats).encode()).hexdigest()
+    return (Path(cache_dir) / f"{prefix}fee_summary_{cache_key}.parquet",
+            Path(cache_dir) / f"{prefix}fee_detail_{cache_key}.parquet")
+
+def cached_frames(cache_dir, pdf_files, build, prefix=''):
+    """
+    Return the (fee_summary_df, fee_detail_df) pair from build(), or from the Parquet cache in
+    cache_dir while pdf_files are unchanged. With cache_dir None, build() always runs
+    """
+    if cache_dir is None:
+        return build()
+
+    fee_summary_path, fee_detail_path = cache_paths(cache_dir, pdf_files, prefix=prefix)
+    if fee_summary_path.exists() and fee_detail_path.exists():
+        logger.info("Loading cached results from %s", cache_dir)
+        return pd.read_parquet(fee_summary_path), pd.read_parquet(fee_detail_path)
+
+    fee_summary_df, fee_detail_df = build()
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        fee_summary_df.to_parquet(fee_summary_path, index=False)
+        fee_detail_df.to_parquet(fee_detail_path, index=False)
+    except (ImportError, OSError) as e:
+        # Caching is only a shortcut for the next run; never fail the current one over it
+        logger.warning("Could not write cache to %s: %s", cache_dir, e)
+    return fee_summary_df, fee_detail_df
+
+def positive_int(value):
+    """
+    argparse type for counts, such as --workers, that must be at least 1
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, not {value}")
+    return number
@@ -0,0 +1,38 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import openpyxl
+import pandas as pd
+
+from excel_sheets import EXCEL_ENGINE, streaming_engine_kwargs, write_sheet
+
+
+class WriteSheetTest(unittest.TestCase):
+
+    def _round_trip(self, df, index):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'out.xlsx')
+            with pd.ExcelWriter(path, engine=EXCEL_ENGINE, engine_kwargs=streaming_engine_kwargs()) as writer:
+                write_sheet(writer, df, 'Sheet', index=index)
+            worksheet = openpyxl.load_workbook(path)['Sheet']
+            return [list(row) for row in worksheet.iter_rows(values_only=True)], worksheet['A1'].font.bold
+
+    def test_writes_bold_header_and_blank_missing_values(self):
+        rows, header_bold = self._round_trip(pd.DataFrame({'hours': [np.nan, 2.0], 'name': ['A', None]}), False)
+
+        self.assertEqual(rows, [['hours', 'name'], [None, 'A'], [2.0, None]])
+        self.assertTrue(header_bold)
+
+    def test_index_labels_become_the_first_column(self):
+        df = pd.DataFrame({'Total Hours': [1.0, 2.0]},
+                          index=pd.Index([(2024, 7), (2024, 8)], name='Year-Month', tupleize_cols=False))
+
+        rows, _ = self._round_trip(df, True)
+
+        self.assertEqual(rows, [['Year-Month', 'Total Hours'], ['(2024, 7)', 1.0], ['(2024, 8)', 2.0]])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,141 @@
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+import invoice_analysis
+
+
+def _fee_detail(dates):
+    return pd.DataFrame({
+        'date': dates,
+        'timekeeper': ['Rorwin, J.K.', 'Cloern, B.', 'Rorwin, J.K.'][:len(dates)],
+        'hours': [1.0, 2.0, 3.0][:len(dates)],
+        'amount': [100.0, 200.0, 300.0][:len(dates)],
+        'matter_no': ['123.01', '123.01', '456.02'][:len(dates)],
+    })
+
+
+class CategorizeTaskTest(unittest.TestCase):
+
+    def test_punctuation_between_words_does_not_split_a_keyword(self):
+        # Punctuation is not a token, so the stemmed text reads 'draft motion paper'
+        self.assertEqual(invoice_analysis.categorize_task('Drafted, motion papers'), 'drafting motion')
+        self.assertEqual(invoice_analysis.categorize_task('Drafted motion; reviewed'), 'drafting motion')
+
+    def test_priority_category_wins(self):
+        self.assertEqual(invoice_analysis.categorize_task('Review documents for settlement conference'), 'settlement')
+
+    def test_no_keyword_is_other(self):
+        self.assertEqual(invoice_analysis.categorize_task('Telephone call with opposing counsel'), 'Other')
+        self.assertEqual(invoice_analysis.categorize_task(''), 'Other')
+
+
+class ReadPdfTextTest(unittest.TestCase):
+
+    def _read(self, pages):
+        closed = []
+
+        def iter_page_text(pdf_path):
+            try:
+                yield from pages
+            finally:
+                closed.append(pdf_path)
+
+        with mock.patch.object(invoice_analysis, '_iter_page_text', iter_page_text):
+            text = invoice_analysis.read_pdf_text('invoice.pdf')
+        self.assertEqual(closed, ['invoice.pdf'])
+        return text
+
+    def test_pages_after_the_fee_detail_total_are_dropped(self):
+        text = self._read([
+            'FEE SUMMARY\nCloern, B. 1.50 1,150.00\n',
+            'FEE DETAIL\n11-Jul-24 Cloern, B. 1.50 Review draft\nTotal 1.50\n',
+            'APPENDIX\nTotal 99.00\n',
+        ])
+
+        self.assertIn('11-Jul-24 Cloern, B. 1.50 Review draft', text)
+        self.assertNotIn('APPENDIX', text)
+
+    def test_total_before_the_fee_detail_heading_does_not_stop_reading(self):
+        text = self._read([
+            'FEE SUMMARY\nTotal 1.50\nFEE DETAIL\n11-Jul-24 Cloern, B. 1.00 Review draft\n',
+            '12-Jul-24 Cloern, B. 0.50 Call client\nTotal 1.50\n',
+            'APPENDIX\n',
+        ])
+
+        self.assertIn('12-Jul-24 Cloern, B. 0.50 Call client', text)
+        self.assertNotIn('APPENDIX', text)
+
+
+class CreateMonthlySummaryTest(unittest.TestCase):
+
+    def test_unparseable_date_is_left_out_of_the_months(self):
+        summary = invoice_analysis.create_monthly_summary(_fee_detail(['11-Jul-24', 'bad', '12-Aug-24']))
+
+        self.assertEqual(summary['Month'].tolist(), ['2024-07', '2024-08'])
+        self.assertEqual(summary['Total Hours'].tolist(), [1.0, 3.0])
+        self.assertEqual(summary['Total Amount'].tolist(), [100.0, 300.0])
+        self.assertEqual(summary['Cumulative Hours'].tolist(), [1.0, 4.0])
+
+
+class CreateMonthlyTimekeeperPivotTest(unittest.TestCase):
+
+    def test_rows_are_labelled_and_ordered_by_matter_then_month(self):
+        fee_detail = pd.DataFrame({
+            'pdf_filename': ['a.pdf', 'a.pdf', 'b.pdf', 'b.pdf', 'b.pdf'],
+            'date': ['12-Aug-24', '11-Jul-24', '11-Jul-24', '15-Jul-24', '02-Aug-24'],
+            'timekeeper': ['Rorwin, J.K.', 'Cloern, B.', 'Rorwin, J.K.', 'Cloern, B.', 'Rorwin, J.K.'],
+            'hours': [1.0, 2.0, 0.5, 1.5, 3.0],
+            'amount': [100.0, 400.0, 50.0, 300.0, 300.0],
+        })
+        fee_summary = pd.DataFrame({
+            'pdf_filename': ['a.pdf', 'b.pdf'],
+            'matter_no': ['200.01', '100.02'],
+            'matter_description': ['Alpha', 'Beta'],
+        })
+
+        pivot = invoice_analysis.create_monthly_timekeeper_pivot(fee_detail, fee_summary)
+
+        self.assertEqual(pivot.columns.tolist(), [
+            'Month', 'Matter No', 'Matter Description', 'Total Hours', 'Total Amount',
+            'Cloern, B. - Hours', 'Rorwin, J.K. - Hours', 'Cloern, B. - Amount', 'Rorwin, J.K. - Amount',
+        ])
+        self.assertEqual(pivot['Matter No'].tolist(), ['100.02', '100.02', '200.01', '200.01'])
+        self.assertEqual(pivot['Month'].tolist(), ['2024-07', '2024-08', '2024-07', '2024-08'])
+        self.assertEqual(pivot['Matter Description'].tolist(), ['Beta', 'Beta', 'Alpha', 'Alpha'])
+        self.assertEqual(pivot['Total Hours'].tolist(), [2.0, 3.0, 2.0, 1.0])
+        self.assertEqual(pivot['Cloern, B. - Hours'].tolist(), [1.5, 0.0, 2.0, 0.0])
+
+
+class IterSheetsTest(unittest.TestCase):
+
+    def test_every_sheet_gets_a_placeholder_without_fee_detail(self):
+        fee_summary = pd.DataFrame({'pdf_filename': ['a.pdf'], 'matter_no': ['123.01'], 'hours': [1.0]})
+
+        sheets = dict(invoice_analysis._iter_sheets(fee_summary, pd.DataFrame()))
+
+        self.assertEqual(list(sheets), [
+            'Fee Summary', 'Fee Detail', 'Task by Month', 'Monthly Summary', 'Monthly Timekeeper',
+        ])
+        self.assertIs(sheets['Fee Summary'], fee_summary)
+        self.assertEqual(sheets['Monthly Summary']['Message'].tolist(),
+                         ['No fee detail data available for monthly summary.'])
+        self.assertEqual(sheets['Fee Detail']['Message'].tolist(), ['No fee detail data found.'])
+
+
+class GroupSumTest(unittest.TestCase):
+
+    def test_skips_code_minus_one_and_nan_values(self):
+        sums = invoice_analysis.group_sum(np.array([0, -1, 1, 0]), np.array([1.0, 5.0, 2.0, np.nan]), 2)
+
+        self.assertEqual(sums.tolist(), [1.0, 2.0])
+
+    def test_rejects_float_codes(self):
+        with self.assertRaises(TypeError):
+            invoice_analysis.group_sum(np.array([0.0, np.nan]), np.array([1.0, 2.0]), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
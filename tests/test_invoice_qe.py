@@ -0,0 +1,36 @@
+import unittest
+
+import invoice_qe
+
+
+FEE_SUMMARY = [
+    ('a.pdf', '15 October 2025', 'INV-1', '123', 'Client', 'Johannes Bukow', 'JB6', 'Partner', 1.0, 1225.0, 1225.0),
+]
+
+FEE_DETAIL_TEXT = '''Statement Detail
+Date Timekeeper Description Hours
+11/07/25 JB6 Review patent EP 627 0,50
+12/07/25 JB6 Draft reply on para. 4.2 comments
+of the brief
+13/07/25 AB1 Call with client
+about strategy 1,25
+14/07/25 JB6 Prepare exhibit list
+Total Hours 1,75
+'''
+
+
+class ExtractQuinnFeeDetailTest(unittest.TestCase):
+
+    def test_entries_without_trailing_hours_are_dropped(self):
+        with self.assertLogs(invoice_qe.logger, 'WARNING'):
+            rows = invoice_qe.extract_quinn_fee_detail(FEE_DETAIL_TEXT, 'a.pdf', FEE_SUMMARY)
+
+        # The 4.2 inside the 12/07 description is not hours, and 14/07 never gets any
+        self.assertEqual(rows, [
+            ('a.pdf', '11/07/25', 'JB6', '0,50', 'Review patent EP 627', 1225.0, 'Johannes Bukow', 'Partner'),
+            ('a.pdf', '13/07/25', 'AB1', '1,25', 'Call with client about strategy', 0.0, 'Unknown', 'Unknown'),
+        ])
+
+
+if __name__ == '__main__':
+    unittest.main()
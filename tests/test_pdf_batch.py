@@ -0,0 +1,59 @@
+import os
+import tempfile
+import unittest
+
+import pandas as pd
+
+import pdf_batch
+
+
+class FindPdfFilesTest(unittest.TestCase):
+
+    def test_matches_extension_in_any_case_and_skips_directories(self):
+        with tempfile.TemporaryDirectory() as directory:
+            for name in ('a.pdf', 'b.PDF', 'notes.txt'):
+                open(os.path.join(directory, name), 'wb').close()
+            os.mkdir(os.path.join(directory, 'folder.pdf'))
+
+            names = sorted(path.name for path in pdf_batch.find_pdf_files(directory))
+
+        self.assertEqual(names, ['a.pdf', 'b.PDF'])
+
+
+
+class CachedFramesTest(unittest.TestCase):
+
+    def test_builds_once_then_reads_the_cache_until_a_file_changes(self):
+        calls = []
+
+        def build():
+            calls.append(1)
+            return pd.DataFrame({'hours': [1.5]}), pd.DataFrame({'hours': [0.5, 1.0]})
+
+        with tempfile.TemporaryDirectory() as directory:
+            pdf_path = os.path.join(directory, 'a.pdf')
+            with open(pdf_path, 'wb') as file:
+                file.write(b'one')
+            cache_dir = os.path.join(directory, 'cache')
+            pdf_files = pdf_batch.find_pdf_files(directory)
+
+            first = pdf_batch.cached_frames(cache_dir, pdf_files, build)
+            second = pdf_batch.cached_frames(cache_dir, pdf_files, build)
+            with open(pdf_path, 'ab') as file:
+                file.write(b' two')
+            pdf_batch.cached_frames(cache_dir, pdf_files, build)
+
+        self.assertEqual(len(calls), 2)
+        for built, cached in zip(first, second):
+            pd.testing.assert_frame_equal(built, cached)
+
+    def test_without_cache_dir_always_builds(self):
+        calls = []
+        pdf_batch.cached_frames(None, [], lambda: calls.append(1) or (pd.DataFrame(), pd.DataFrame()))
+        pdf_batch.cached_frames(None, [], lambda: calls.append(1) or (pd.DataFrame(), pd.DataFrame()))
+
+        self.assertEqual(len(calls), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()